@@ -0,0 +1,53 @@
+"""
+Combineのチェーンの長さごとに、一秒あたりに流せる値の数とチェーンを作る時間を計測します。
+
+    PYTHONPATH=. python benchmarks/combine.py [values]
+"""
+import asyncio
+import sys
+import time
+
+from discord.ext.ui.combine import AsyncPublisher, PassThroughSubject
+
+
+def increment(x: int) -> int:
+    return x + 1
+
+
+def measure_sync(depth: int, values: int) -> tuple[float, float]:
+    started = time.perf_counter()
+    subject = PassThroughSubject()
+    for _ in range(depth):
+        subject.map(increment)
+    built = time.perf_counter() - started
+    subject.sink(lambda _: None)
+
+    started = time.perf_counter()
+    for i in range(values):
+        subject.send(i)
+    return built, values / (time.perf_counter() - started)
+
+
+async def measure_async(depth: int, values: int) -> float:
+    publisher = AsyncPublisher()
+    for _ in range(depth):
+        publisher.map(increment)
+    await publisher.sink(lambda _: None)
+
+    started = time.perf_counter()
+    for i in range(values):
+        await publisher.upstream(i)
+    return values / (time.perf_counter() - started)
+
+
+def main(values: int) -> None:
+    print(f"{'depth':>6} {'build':>10} {'sync values/s':>15} {'async values/s':>15}")
+    for depth in (1, 10, 100, 1000, 10000):
+        count = max(10, values // depth)
+        built, sync_rate = measure_sync(depth, count)
+        async_rate = asyncio.run(measure_async(depth, count))
+        print(f"{depth:>6} {built * 1000:>8.2f}ms {sync_rate:>15,.0f} {async_rate:>15,.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,59 @@
+"""
+描画したMessageと、追跡中のView一つあたりが使うメモリを計測します。
+
+    PYTHONPATH=. python benchmarks/memory.py [views]
+"""
+import asyncio
+import sys
+import tracemalloc
+from typing import Awaitable, Callable
+
+import discord
+
+from discord.ext.ui import Button, Message, Select, SelectOption, View, ViewTracker, state
+
+
+class GridView(View):
+    count = state("count")
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    async def body(self) -> Message:
+        return Message(
+            f"count: {self.count}",
+            components=[
+                [Button(f"{x},{y}").style(discord.ButtonStyle.gray) for x in range(5)]
+                for y in range(4)
+            ] + [
+                Select(options=[SelectOption(f"option {i}").to_discord_select_option() for i in range(5)])
+            ]
+        )
+
+
+async def measure(views: int, create: Callable[[], Awaitable[object]]) -> float:
+    tracemalloc.start()
+    snapshot = tracemalloc.take_snapshot()
+    kept = [await create() for _ in range(views)]
+    size = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(snapshot, "filename"))
+    tracemalloc.stop()
+    del kept
+    return size / views
+
+
+async def main(views: int) -> None:
+    view = GridView()
+
+    async def track() -> ViewTracker:
+        tracker = ViewTracker(GridView())
+        tracker.body = await tracker.view._render_message()
+        tracker._reconcile(tracker.body)
+        return tracker
+
+    print(f"rendered Message: {await measure(views, view.body):,.0f} bytes")
+    print(f"tracked view:     {await measure(views, track):,.0f} bytes")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000))
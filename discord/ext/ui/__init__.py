@@ -1,15 +1,23 @@
 # flake8: noqa
 from .view import View
+from .group import ViewGroup
 from .tracker import ViewTracker
+from .registry import TrackerRegistry
+from .dispatcher import ComponentDispatcher
+from .timer import TimerWheel
+from .render_cache import RenderCache
+from .persistent import PersistentView, PersistentViewManager, ViewStore, SQLiteViewStore
 from .provider import MessageProvider, InteractionProvider
+from .ratelimit import EditQueue
 from .button import LinkButton, Button
 from .message import Message
 from .observable_object import ObservableObject
 from .state import state
 from .published import published
 from .select import SelectOption, Select
-from .page import PaginationView, PaginationButtons, PageView
-from .alert import Alert, ActionButton
+from .virtual_select import VirtualSelect
+from .page import PaginationView, PaginationButtons, PageView, PageSource, CallablePageSource, IteratorPageSource
+from .alert import Alert, ActionButton, Poll
 from .modal import Modal
 
 
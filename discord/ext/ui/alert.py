@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Any
+from collections import Counter
+from typing import Any, Hashable
 
 import discord
 
@@ -10,6 +11,7 @@ from .button import Button
 from .message import Message
 from .tracker import ViewTracker
 from .provider import InteractionProvider
+from .utils import interaction_partial
 
 
 class Alert(View):
@@ -34,11 +36,12 @@ class Alert(View):
 
         self.buttons = buttons
 
+    def _embed(self) -> discord.Embed:
+        return discord.Embed(title=self.title, description=self.text, colour=discord.Colour.blurple())
+
     async def body(self) -> Message | View:
         self._set_func()
-        return Message(embeds=[
-            discord.Embed(title=self.title, description=self.text, colour=discord.Colour.blurple())
-        ], components=self.buttons)
+        return Message(embeds=[self._embed()], components=self.buttons)
 
     async def wait_for_click(self, interaction: discord.Interaction, timeout: float | None = 180.0):
         tracker = ViewTracker(self, timeout)
@@ -48,7 +51,101 @@ class Alert(View):
         return self.clicked.result()
 
 
+class Poll(Alert):
+    """
+    複数のユーザーの投票を集計するAlertです。一人一票で、allow_changeがTrueの場合は投票し直せます。
+    表示の更新はupdate_delay秒ごとにまとめて行われるため、投票ごとにメッセージは編集されません。
+    """
+    update_delay: float = 2.0
+
+    def __init__(
+            self,
+            title: str,
+            text: str,
+            buttons: list[ActionButton | list[ActionButton]],
+            ephemeral: bool = False,
+            allow_change: bool = True
+    ):
+        super().__init__(title, text, buttons, ephemeral)
+        self.allow_change = allow_change
+        self.votes: dict[int, Hashable] = {}
+        self.tally: Counter = Counter()
+        self.finished = False
+
+    def _set_func(self):
+        for button in self._flat_buttons():
+            button.on_click(interaction_partial(self.vote, button.value)).disabled(self.finished)
+
+    def _flat_buttons(self) -> list[ActionButton]:
+        buttons = []
+        for button in self.buttons:
+            if isinstance(button, list):
+                buttons.extend(button)
+            else:
+                buttons.append(button)
+        return buttons
+
+    def vote(self, interaction: discord.Interaction, value: Hashable) -> None:
+        if self.finished:
+            return
+        user_id = interaction.user.id
+        previous = self.votes.get(user_id, _NO_VOTE)
+        if previous == value or (previous is not _NO_VOTE and not self.allow_change):
+            return
+        if previous is not _NO_VOTE:
+            self.tally[previous] -= 1
+        self.votes[user_id] = value
+        self.tally[value] += 1
+        self.update_sync()
+
+    def results(self) -> list[tuple[ActionButton, int]]:
+        return [(button, self.tally[button.value]) for button in self._flat_buttons()]
+
+    def _embed(self) -> discord.Embed:
+        total = len(self.votes)
+        embed = super()._embed()
+        for button, count in self.results():
+            percent = count * 100 // total if total else 0
+            embed.add_field(name=button._label, value=f"{count}票 ({percent}%)", inline=False)
+        embed.set_footer(text=f"合計 {total}票" + (" (終了)" if self.finished else ""))
+        return embed
+
+    def close(self) -> None:
+        if not self.clicked.done():
+            self.clicked.set_result(None)
+
+    async def wait_for_close(self, interaction: discord.Interaction, timeout: float | None = 180.0) -> Counter:
+        """
+        投票を送信し、timeout秒経つかcloseが呼ばれるまで待って集計結果を返します。
+        """
+        # 投票ごとに再描画を待たず、すぐに応答する
+        tracker = ViewTracker(self, None, response_timeout=None)
+        await tracker.track(InteractionProvider(interaction, ephemeral=self.ephemeral))
+        try:
+            await asyncio.wait_for(asyncio.shield(self.clicked), timeout)
+        except asyncio.TimeoutError:
+            pass
+        await self._finish()
+        return self.tally
+
+    async def _finish(self) -> None:
+        self.finished = True
+        if self._update_handle is not None:
+            # まとめて行う予定だった再描画は、最後の再描画に含まれる
+            self._update_handle.cancel()
+            self._update_handle = None
+        # 投票による再描画が実行中でも、終了した状態の描画と送信が終わるまで待ってからstopする
+        if self._tracker is not None:
+            await self._tracker.update()
+        self.stop()
+
+
+_NO_VOTE: Any = object()
+
+
 class ActionButton(Button):
+    __slots__ = ('value', 'clicked')
+
     def __init__(self, label: str, style: discord.ButtonStyle, value: Any, **kwargs):
         super().__init__(label=label, style=style, **kwargs)
         self.value = value
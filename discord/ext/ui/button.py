@@ -8,20 +8,38 @@ from discord import ui
 from .item import Item
 from .custom import CustomButton
 from .modal import Modal
+from .spec import ButtonSpec, LinkButtonSpec, intern_spec
 
 
 class LinkButton(Item):
+    __slots__ = ('url', 'label')
+
     def __init__(self, url: str, label: str):
         self.url = url
         self.label = label
 
+    def spec(self) -> LinkButtonSpec:
+        return intern_spec(LinkButtonSpec(self.url, self.label))
+
     def to_discord_item(self, row: Optional[int]) -> ui.Item:
         button = ui.Button(style=discord.ButtonStyle.link, label=self.label, url=self.url)
         button.row = row
         return button
 
+    def update_discord_item(self, item: ui.Item) -> bool:
+        if not isinstance(item, ui.Button) or item.url is None:
+            return False
+        item.label = self.label
+        item.url = self.url
+        return True
+
 
 class Button(Item):
+    __slots__ = (
+        '_style', '_label', '_disabled', '_emoji', '_custom_id',
+        'callback_func', 'check_func', 'modal_submit', '_spec',
+    )
+
     def __init__(
             self,
             label: str = "",
@@ -39,35 +57,37 @@ class Button(Item):
         self.callback_func: Optional[Callable[[discord.Interaction], Any]] = None
         self.check_func: Optional[Callable[[discord.Interaction], bool]] = None
         self.modal_submit: Optional[Modal] = None
+        self._spec: Optional[ButtonSpec] = None
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Button):
             return NotImplemented
 
-        return self._label == other._label\
-            and self._style == other._style\
-            and self._disabled == other._disabled\
-            and self._emoji == other._emoji\
-            and self._custom_id == other._custom_id
+        return self.spec() == other.spec()
 
     def style(self, style: discord.ButtonStyle) -> Button:
         self._style = style
+        self._spec = None
         return self
 
     def label(self, label: str) -> Button:
         self._label = label
+        self._spec = None
         return self
 
     def disabled(self, disabled: bool = False) -> Button:
         self._disabled = disabled
+        self._spec = None
         return self
 
     def emoji(self, emoji: Union[str, discord.PartialEmoji]) -> Button:
         self._emoji = emoji
+        self._spec = None
         return self
 
     def custom_id(self, custom_id: str) -> Button:
         self._custom_id = custom_id
+        self._spec = None
         return self
 
     def on_click(self, func: Callable[[discord.Interaction], Any]) -> Button:
@@ -82,6 +102,11 @@ class Button(Item):
         self.check_func = func
         return self
 
+    def spec(self) -> ButtonSpec:
+        if self._spec is None:
+            self._spec = intern_spec(ButtonSpec(self._label, self._style, self._disabled, self._emoji, self._custom_id))
+        return self._spec
+
     def to_discord_item(self, row: Optional[int]) -> ui.Item:
         button = CustomButton(
             self._label,
@@ -94,5 +119,23 @@ class Button(Item):
         button.check_func = self.check_func
         button.callback_func = self.callback_func
         button.row = row
+        button._spec = self.spec()
         return button
 
+    def update_discord_item(self, item: ui.Item) -> bool:
+        if not isinstance(item, CustomButton):
+            return False
+        spec = self.spec()
+        if item._spec is not spec:
+            item.label = self._label
+            item.style = self._style
+            item.disabled = self._disabled
+            item.emoji = self._emoji
+            if self._custom_id is not None:
+                item.custom_id = self._custom_id
+            item._spec = spec
+        item.modal_submit = self.modal_submit
+        item.check_func = self.check_func
+        item.callback_func = self.callback_func
+        return True
+
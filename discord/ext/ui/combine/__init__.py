@@ -1,5 +1,5 @@
-from .publisher import Publisher
+from .publisher import Publisher, SharePublisher
 from .just import Just
 from .subject import PassThroughSubject
 from .url_request import URLRequestPublisher
-from .async_publisher import AsyncPublisher, AsyncMapPublisher
+from .async_publisher import AsyncPublisher, AsyncMapPublisher, AsyncSharePublisher
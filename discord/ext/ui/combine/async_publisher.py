@@ -3,7 +3,7 @@ from __future__ import annotations
 import asyncio
 from typing import Any, Callable, Optional
 
-from .publisher import Publisher, MapPublisher
+from .publisher import Publisher, MapPublisher, SharePublisher
 
 
 async def _call_any(func: Callable, *args: Any, **kwargs: Any) -> Any:
@@ -13,59 +13,100 @@ async def _call_any(func: Callable, *args: Any, **kwargs: Any) -> Any:
 
 
 class AsyncPublisher(Publisher):
-    def __init__(self):
+    def __init__(self) -> None:
         super().__init__()
         self.child: Optional[AsyncPublisher] = None
         self.parent: Optional[AsyncPublisher] = None
         self.subscribers: list[Callable[[Any], None]] = []
 
-    def chain(self, new_publisher: AsyncPublisher) -> AsyncPublisher:
-        new_publisher.parent = self
-        self.set_child(new_publisher)
-        return new_publisher
+    async def _transform(self, value: Any) -> Any:
+        return value
 
     async def downstream(self, value: Any):
-        if self.parent is not None:
-            await self.parent.downstream(value)
+        root = self._root
+        if root is not self:
+            await root.downstream(value)
 
     async def upstream(self, value: Any):
-        if self.child is not None:
-            await self.child.upstream(value)
-
-        for func in self.subscribers:
-            await _call_any(func, value)
+        stack: list[tuple[Publisher, Any]] = [(self, value)]
+        publisher: Optional[Publisher]
+        while stack:
+            publisher, value = stack.pop()
+            # 分岐がなければ子を順に辿るだけにする
+            while publisher is not None:
+                value = await publisher._transform(value)
+                for func in publisher.subscribers:
+                    await _call_any(func, value)
+                if publisher._branches:
+                    stack.extend((branch, value) for branch in reversed(publisher._branches))
+                publisher = publisher.child
 
     async def dispatch(self) -> Any:
-        if self.parent is not None:
-            await self.parent.dispatch()
+        root = self._root
+        if root is not self:
+            await root.dispatch()
 
     async def sink(self, func: Callable[[Any], None]) -> AsyncPublisher:
-        if self.child is not None:
-            await self.child.sink(func)
-            return self
-        self.subscribers.append(func)
-        await self.dispatch()
+        tail = self.tail()
+        tail.subscribers.append(func)
+        await tail.dispatch()
         return self
 
     def map(self, func: Callable[[Any], Any]) -> AsyncPublisher:
-        if self.child is not None:
-            self.child.map(func)
-            return self
-        new_publisher = AsyncMapPublisher(func)
-        self.chain(new_publisher)
+        self.tail().chain(AsyncMapPublisher(func))
         return self
 
+    def share(self) -> AsyncSharePublisher:
+        return self.tail().chain(AsyncSharePublisher())
+
 
 class AsyncMapPublisher(MapPublisher, AsyncPublisher):
     def __init__(self, func: Callable[[Any], Any]) -> None:
         super().__init__(func)
         self.map_func = func
 
-    async def upstream(self, value: Any):
+    async def _transform(self, value: Any) -> Any:
         if isinstance(value, list):
-            value = [await _call_any(self.map_func, v) for v in value]
-        else:
-            value = await _call_any(self.map_func, value)
+            return [await _call_any(self.map_func, v) for v in value]
+        return await _call_any(self.map_func, value)
+
+
+class AsyncSharePublisher(SharePublisher, AsyncPublisher):
+    """
+    SharePublisherの非同期版です。URLRequestPublisherなどのリクエストを一度だけ行います。
+    """
+    async def _transform(self, value: Any) -> Any:
+        return SharePublisher._transform(self, value)
+
+    def branch(self) -> AsyncPublisher:
+        branch = _AsyncBranch(self)
+        self._branches.append(branch)
+        return branch
+
+    def map(self, func: Callable[[Any], Any]) -> AsyncPublisher:
+        return self.branch().map(func)
 
-        for func in self.subscribers:
-            await _call_any(func, value)
+    async def dispatch(self) -> Any:
+        # sinkから呼ばれた時、値が届いていれば追加されたsubscriberにだけ最後の値を渡す
+        if self._has_value:
+            if self.subscribers:
+                await _call_any(self.subscribers[-1], self._last)
+        elif not self._dispatched:
+            self._dispatched = True
+            await AsyncPublisher.dispatch(self)
+
+
+class _AsyncBranch(AsyncPublisher):
+    def __init__(self, source: AsyncSharePublisher) -> None:
+        super().__init__()
+        self.source = source
+
+    async def downstream(self, value: Any):
+        await self.source.downstream(value)
+
+    async def dispatch(self) -> Any:
+        source = self.source
+        if source._has_value:
+            await self.upstream(source._last)
+        else:
+            await source.dispatch()
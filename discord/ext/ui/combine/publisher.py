@@ -1,32 +1,56 @@
 from __future__ import annotations
 
 
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Optional, Sequence, TypeVar
+
+_P = TypeVar("_P", bound="Publisher")
 
 
 class Publisher:
-    def __init__(self):
+    # shareで分岐した先のPublisher
+    _branches: Sequence[Publisher] = ()
+
+    def __init__(self) -> None:
         self.child: Optional[Publisher] = None
         self.parent: Optional[Publisher] = None
         self.subscribers: list[Callable[[Any], None]] = []
+        # チェーンの先頭と、先頭から見た末尾。mapやsinkで末尾まで辿らずに済むようにする
+        self._root: Publisher = self
+        self._tail: Publisher = self
 
     def set_child(self, child: Publisher) -> Publisher:
         self.child = child
         return self
 
-    def chain(self, new_publisher: Publisher) -> Publisher:
+    def chain(self, new_publisher: _P) -> _P:
         new_publisher.parent = self
+        new_publisher._root = self._root
         self.set_child(new_publisher)
+        if self._root._tail is self:
+            self._root._tail = new_publisher
         return new_publisher
 
+    def root(self) -> Publisher:
+        return self._root
+
+    def tail(self) -> Publisher:
+        return self._root._tail
+
+    def _transform(self, value: Any) -> Any:
+        """
+        親から受け取った値を子とsubscriberに渡す前に変換します。
+        """
+        return value
+
     def downstream(self, value: Any):
         """
         親に伝播する
         :param value:
         :return:
         """
-        if self.parent is not None:
-            self.parent.downstream(value)
+        root = self._root
+        if root is not self:
+            root.downstream(value)
 
     def upstream(self, value: Any):
         """
@@ -34,47 +58,107 @@ class Publisher:
         :param value:
         :return:
         """
-        if self.child is not None:
-            self.child.upstream(value)
-
-        for func in self.subscribers:
-            func(value)
+        stack: list[tuple[Publisher, Any]] = [(self, value)]
+        publisher: Optional[Publisher]
+        while stack:
+            publisher, value = stack.pop()
+            # 分岐がなければ子を順に辿るだけにする
+            while publisher is not None:
+                value = publisher._transform(value)
+                for func in publisher.subscribers:
+                    func(value)
+                if publisher._branches:
+                    stack.extend((branch, value) for branch in reversed(publisher._branches))
+                publisher = publisher.child
 
     def dispatch(self) -> Any:
         """
         subscriberが追加された時に初回起動させる
         :return:
         """
-        if self.parent is not None:
-            self.parent.dispatch()
+        root = self._root
+        if root is not self:
+            root.dispatch()
 
     def sink(self, func: Callable[[Any], None]) -> Publisher:
-        if self.child is not None:
-            self.child.sink(func)
-            return self
-        self.subscribers.append(func)
-        self.dispatch()
+        tail = self.tail()
+        tail.subscribers.append(func)
+        tail.dispatch()
         return self
 
     def map(self, func: Callable[[Any], Any]) -> Publisher:
-        if self.child is not None:
-            self.child.map(func)
-            return self
-        new_publisher = MapPublisher(func)
-        self.chain(new_publisher)
+        self.tail().chain(MapPublisher(func))
         return self
 
+    def share(self) -> SharePublisher:
+        """
+        複数のチェーンで一つの値を共有するPublisherを末尾に追加して返します。
+        """
+        return self.tail().chain(SharePublisher())
+
 
 class MapPublisher(Publisher):
     def __init__(self, func: Callable[[Any], Any]) -> None:
         super().__init__()
         self.map_func = func
 
-    def upstream(self, value: Any):
+    def _transform(self, value: Any) -> Any:
         if isinstance(value, list):
-            value = [self.map_func(v) for v in value]
-        else:
-            value = self.map_func(value)
+            return [self.map_func(v) for v in value]
+        return self.map_func(value)
+
+
+class SharePublisher(Publisher):
+    """
+    上流を一度だけ実行し、その値をすべての分岐に渡します。
+    mapやbranchを呼ぶたびに新しい分岐が作られます。
+    値が届いた後に追加された分岐には、最後の値が渡されます。
+    """
+    def __init__(self) -> None:
+        super().__init__()
+        self._branches: list[Publisher] = []
+        self._dispatched = False
+        self._has_value = False
+        self._last: Any = None
 
-        for func in self.subscribers:
-            func(value)
+    def _transform(self, value: Any) -> Any:
+        self._last = value
+        self._has_value = True
+        return value
+
+    def branch(self) -> Publisher:
+        branch = _Branch(self)
+        self._branches.append(branch)
+        return branch
+
+    def map(self, func: Callable[[Any], Any]) -> Publisher:
+        return self.branch().map(func)
+
+    def tail(self) -> Publisher:
+        # 下流は分岐として作られるため、sinkは常に自身に追加する
+        return self
+
+    def dispatch(self) -> Any:
+        # sinkから呼ばれた時、値が届いていれば追加されたsubscriberにだけ最後の値を渡す
+        if self._has_value:
+            if self.subscribers:
+                self.subscribers[-1](self._last)
+        elif not self._dispatched:
+            self._dispatched = True
+            super().dispatch()
+
+
+class _Branch(Publisher):
+    def __init__(self, source: SharePublisher) -> None:
+        super().__init__()
+        self.source = source
+
+    def downstream(self, value: Any):
+        self.source.downstream(value)
+
+    def dispatch(self) -> Any:
+        source = self.source
+        if source._has_value:
+            self.upstream(source._last)
+        else:
+            source.dispatch()
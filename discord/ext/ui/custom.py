@@ -5,8 +5,9 @@ import discord
 from discord import ui
 from discord.utils import MISSING
 
-from .utils import _call_any
+from .utils import _is_coroutine_function
 from .modal import Modal
+from .spec import ButtonSpec, SelectSpec
 
 
 class CustomButton(ui.Button):
@@ -20,20 +21,41 @@ class CustomButton(ui.Button):
             modal_submit: Optional[Modal] = None
     ):
         super().__init__(label=label, style=style, disabled=disabled, emoji=emoji, custom_id=custom_id)
-        self.callback_func: Optional[Callable] = None
+        self._callback_func: Optional[Callable] = None
+        self._callback_is_coroutine: bool = False
+        self.callback_func = None
         self.check_func: Optional[Callable[[discord.Interaction], bool]] = None
         self.modal_submit = modal_submit
+        # 最後に反映したspec。同じspecであれば書き換えを省略する
+        self._spec: Optional[ButtonSpec] = None
+
+    @property
+    def callback_func(self) -> Optional[Callable]:
+        return self._callback_func
+
+    @callback_func.setter
+    def callback_func(self, func: Optional[Callable]) -> None:
+        # コルーチン関数かどうかはクリックのたびではなく登録時に調べる
+        self._callback_func = func
+        self._callback_is_coroutine = func is not None and _is_coroutine_function(func)
 
     async def callback(self, interaction: discord.Interaction) -> None:
-        if self.callback_func is None and self.modal_submit is None:
+        if self._callback_func is None and self.modal_submit is None:
             return
         if self.check_func is not None:
             if not self.check_func(interaction):
                 return
         if self.modal_submit is not None:
+            # 送信された時に開いたViewを更新できるよう、Trackerを結び付ける
+            self.modal_submit.tracker = self.view
             await interaction.response.send_modal(self.modal_submit)
             return
-        await _call_any(self.callback_func, interaction)
+        func = self._callback_func
+        if func is None:
+            return
+        result = func(interaction)
+        if self._callback_is_coroutine:
+            await result
 
 
 class CustomSelect(ui.Select):
@@ -48,7 +70,7 @@ class CustomSelect(ui.Select):
             disabled: bool = False,
             row: Optional[int] = None,
             callback: Optional[Callable] = None,
-            check_func: Callable[[discord.Interaction], bool]
+            check_func: Optional[Callable[[discord.Interaction], bool]]
     ) -> None:
         custom_id = custom_id or MISSING
         options = options or MISSING
@@ -61,19 +83,40 @@ class CustomSelect(ui.Select):
             disabled=disabled,
             row=row
         )
+        self._callback_func: Optional[Callable] = None
+        self._callback_is_coroutine: bool = False
         self.callback_func = callback
         self.check_func = check_func
+        self._spec: Optional[SelectSpec] = None
+        self._options_by_value: dict[str, discord.SelectOption] = {}
+        self.index_options()
+
+    def index_options(self) -> None:
+        """
+        選択された値からoptionを探すための辞書を作り直します。optionsを変更した後に呼んでください。
+        """
+        self._options_by_value = {option.value: option for option in self.options}
+
+    @property
+    def callback_func(self) -> Optional[Callable]:
+        return self._callback_func
+
+    @callback_func.setter
+    def callback_func(self, func: Optional[Callable]) -> None:
+        self._callback_func = func
+        self._callback_is_coroutine = func is not None and _is_coroutine_function(func)
 
     async def callback(self, interaction: discord.Interaction) -> None:
-        if self.callback_func is None:
+        if self._callback_func is None:
             return
         if self.check_func is not None:
             if not self.check_func(interaction):
                 return
-        selected_options = []
-        for label in interaction.data.get("values", []):
-            for option in self.options:
-                if option.label == label:
-                    selected_options.append(option)
-                    continue
-        await _call_any(self.callback_func, interaction, selected_options)
+        selected_options = [
+            self._options_by_value[value]
+            for value in interaction.data.get("values", [])
+            if value in self._options_by_value
+        ]
+        result = self._callback_func(interaction, selected_options)
+        if self._callback_is_coroutine:
+            await result
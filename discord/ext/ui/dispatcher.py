@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from typing import Iterable, Optional, TYPE_CHECKING
+
+import discord
+from discord import ui
+
+if TYPE_CHECKING:
+    from .tracker import ViewTracker
+
+
+class ComponentDispatcher:
+    """
+    custom_idからViewTrackerとItemを直接引いてinteractionを処理します。
+    ViewTrackerにdispatcherを渡すと、custom_idは`prefix:key:item`の形になり、
+    discord.py側には登録されなくなります。on_interactionイベントからon_interactionを呼んでください。
+    discord.pyのtimeoutは動かないため、期限はTrackerRegistryのidle_timeoutで指定してください。
+    prefixはPersistentViewManagerのもの(既定では"ui")と重ならないようにしてください。
+    """
+    def __init__(self, prefix: str = "uir") -> None:
+        self.prefix = prefix
+        self._routes: dict[str, ViewTracker] = {}
+
+    def __len__(self) -> int:
+        return len(self._routes)
+
+    def update(self, tracker: ViewTracker, old: Iterable[str], new: Iterable[str]) -> None:
+        new = set(new)
+        for custom_id in old:
+            if custom_id not in new and self._routes.get(custom_id) is tracker:
+                del self._routes[custom_id]
+        for custom_id in new:
+            self._routes[custom_id] = tracker
+
+    def remove(self, tracker: ViewTracker) -> None:
+        self.update(tracker, tracker._routes, ())
+
+    def get(self, custom_id: str) -> Optional[tuple[ViewTracker, ui.Item]]:
+        tracker = self._routes.get(custom_id)
+        if tracker is None:
+            return None
+        item = tracker._routes.get(custom_id)
+        if item is None:
+            return None
+        return tracker, item
+
+    async def on_interaction(self, interaction: discord.Interaction) -> bool:
+        """
+        interactionを処理した場合はTrueを返します。
+        """
+        if interaction.type is not discord.InteractionType.component or interaction.data is None:
+            return False
+        found = self.get(str(interaction.data.get("custom_id", "")))
+        if found is None:
+            return False
+        tracker, item = found
+        if tracker.is_finished():
+            return False
+        tracker._dispatch_item(item, interaction)
+        return True
+
+
+default_dispatcher = ComponentDispatcher()
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Optional
+
+from .message import Message
+from .view import View
+
+
+class ViewGroup(View):
+    """
+    複数のViewを一つのMessageにまとめて表示します。
+    contentは改行でつなげられ、embedとcomponentは順番に追加されます。
+    各Viewの描画結果は保存され、変更されたViewだけが並行して再描画されます。
+    """
+    def __init__(self, *views: View, separator: str = "\n"):
+        super().__init__()
+        self.views: list[View] = list(views)
+        self.separator = separator
+        self._outputs: dict[int, Message] = {}
+        for view in self.views:
+            view._super_view = self
+
+    async def _render_child(self, view: View) -> None:
+        self._outputs[id(view)] = await view._render_message()
+
+    async def body(self) -> Message | View:
+        await asyncio.gather(*(
+            self._render_child(view)
+            for view in self.views
+            if view._dirty or id(view) not in self._outputs
+        ))
+        return self._merge([self._outputs[id(view)] for view in self.views])
+
+    def _merge(self, messages: list[Message]) -> Message:
+        message = Message(self.separator.join(m._content for m in messages if m._content))
+        for m in messages:
+            message.embeds(m._embeds)
+            message.items(m._components)
+        return message
+
+    def child(self, view: View, index: Optional[int] = None) -> ViewGroup:
+        view._super_view = self
+        if index is None:
+            self.views.append(view)
+        else:
+            self.views.insert(index, view)
+        self.update_sync()
+        return self
+
+    def remove_child(self, view: View) -> ViewGroup:
+        self.views.remove(view)
+        self._outputs.pop(id(view), None)
+        view._super_view = None
+        self.update_sync()
+        return self
@@ -1,9 +1,25 @@
 from __future__ import annotations
-from typing import Optional
+from typing import Optional, Hashable
 
 from discord import ui
 
 
 class Item:
+    __slots__ = ()
+
     def to_discord_item(self, row: Optional[int]) -> ui.Item:
         pass
+
+    def update_discord_item(self, item: ui.Item) -> bool:
+        """
+        前回の描画で作られたdiscordのItemをこのItemの内容で書き換えます。
+        書き換えられない場合はFalseを返し、to_discord_itemで作り直されます。
+        """
+        return False
+
+    def spec(self) -> Hashable:
+        """
+        描画結果を比較するための値を返します。
+        同じ見た目になるItemは同じ値を返す必要があります。
+        """
+        return type(self).__name__, id(self)
@@ -1,5 +1,7 @@
 from __future__ import annotations
-from typing import Union
+import hashlib
+import json
+from typing import Hashable, Optional, Union
 
 import discord
 from discord import ui
@@ -7,7 +9,21 @@ from discord import ui
 from .item import Item
 
 
+def _item_key(item: Item, row: Optional[int], index: int) -> Hashable:
+    custom_id = getattr(item, "_custom_id", None)
+    if custom_id is not None:
+        return row, type(item).__name__, custom_id
+    return row, type(item).__name__, index
+
+
+def _item_spec(item: Item) -> tuple:
+    spec = item.spec()
+    return type(spec).__name__, spec
+
+
 class Message:
+    __slots__ = ('_content', '_embeds', '_components', '_fingerprint')
+
     def __init__(
             self,
             content: str = "",
@@ -16,41 +32,79 @@ class Message:
         self._content = content
         self._embeds: list[discord.Embed] = embeds or []
         self._components: list[Union[list[Item], Item]] = components or []
+        self._fingerprint: Optional[str] = None
 
     def content(self, content: str) -> Message:
         self._content = content
+        self._fingerprint = None
         return self
 
     def embed(self, embed: discord.Embed) -> Message:
         self._embeds.append(embed)
+        self._fingerprint = None
         return self
 
     def embeds(self, embeds: list[discord.Embed]) -> Message:
         self._embeds.extend(embeds)
+        self._fingerprint = None
         return self
 
     def item(self, item: Union[list[Item], Item]) -> Message:
         self._components.append(item)
+        self._fingerprint = None
         return self
 
     def items(self, items: list[Union[list[Item], Item]]) -> Message:
         self._components.extend(items)
+        self._fingerprint = None
         return self
 
+    def copy(self) -> Message:
+        message = Message(self._content, list(self._embeds), list(self._components))
+        message._fingerprint = self._fingerprint
+        return message
+
     def get_discord_items(self) -> list[ui.Item]:
+        return [item.to_discord_item(row) for _, item, row in self.get_keyed_items()]
+
+    def get_keyed_items(self) -> list[tuple[Hashable, Item, Optional[int]]]:
+        """
+        再描画の間で同じItemを判別するためのキーと、Item、行番号の組を返します。
+        キーはcustom_idがあればcustom_id、なければ行と行内の位置です。
+        """
         row = 0
-        items = []
+        position = 0
+        items: list[tuple[Hashable, Item, Optional[int]]] = []
         for component in self._components:
             if isinstance(component, list):
-                for sub_component in component:  # type: Item
-                    items.append(sub_component.to_discord_item(row))
+                for index, sub_component in enumerate(component):  # type: int, Item
+                    items.append((_item_key(sub_component, row, index), sub_component, row))
                 row += 1
             else:
-                items.append(component.to_discord_item(None))
+                items.append((_item_key(component, None, position), component, None))
+                position += 1
 
         return items
 
-    def __eq__(self, other: Message) -> bool:
-        return self._components == other._components\
-               and self._embeds == other._embeds\
-               and self._content == other._content
+    def fingerprint(self) -> str:
+        """
+        content, embed, componentから計算したハッシュを返します。
+        一度計算した値はMessageが変更されるまで再利用されます。
+        """
+        if self._fingerprint is None:
+            components = [
+                [_item_spec(item) for item in component] if isinstance(component, list) else _item_spec(component)
+                for component in self._components
+            ]
+            source = json.dumps(
+                [self._content, [embed.to_dict() for embed in self._embeds], components],
+                sort_keys=True,
+                default=str,
+            )
+            self._fingerprint = hashlib.blake2b(source.encode(), digest_size=16).hexdigest()
+        return self._fingerprint
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Message):
+            return NotImplemented
+        return self.fingerprint() == other.fingerprint()
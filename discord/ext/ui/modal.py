@@ -3,9 +3,12 @@ from __future__ import annotations
 from discord import ui
 import discord
 
-from typing import List, Callable, Any
+from typing import List, Callable, Any, Optional, TYPE_CHECKING
 from .utils import _call_any
 
+if TYPE_CHECKING:
+    from .tracker import ViewTracker
+
 
 class Modal(ui.Modal):
     def __init__(self, title: str, components: List[ui.TextInput]):
@@ -14,13 +17,44 @@ class Modal(ui.Modal):
             self.add_item(component)
 
         self._hook = None
+        self._bindings: list[tuple[str, ui.TextInput, Any, Optional[Callable[[str], Any]]]] = []
+        # Button.modalから開かれた場合は、開いたViewのTrackerが設定される
+        self.tracker: Optional[ViewTracker] = None
 
     def hook(self, func: Callable[[discord.Interaction], Any]) -> Modal:
         self._hook = func
         return self
 
-    async def on_submit(self, interaction: discord.Interaction) -> None:
+    def bind(
+            self,
+            attr: str,
+            text_input: ui.TextInput,
+            target: Any = None,
+            convert: Optional[Callable[[str], Any]] = None
+    ) -> Modal:
+        """
+        送信された時にtext_inputの値をtargetのattrに代入します。
+        targetを省略した場合は、Modalを開いたボタンがあるView(ViewTrackerに渡したView)に代入します。
+        convertを渡すと、代入する前に値を変換します。
+        """
+        self._bindings.append((attr, text_input, target, convert))
+        return self
+
+    async def _apply(self, view: Optional[Any], interaction: discord.Interaction) -> None:
+        for attr, text_input, target, convert in self._bindings:
+            target = target if target is not None else view
+            if target is None:
+                continue
+            value = text_input.value
+            setattr(target, attr, convert(value) if convert is not None else value)
         if self._hook is not None:
             await _call_any(self._hook, interaction)
+
+    async def on_submit(self, interaction: discord.Interaction) -> None:
+        if self.tracker is not None and not self.tracker.is_finished():
+            # stateの変更による再描画を、このinteractionへの応答として送る
+            await self.tracker._submit_modal(self, interaction)
+            return
+        await self._apply(None, interaction)
         if not interaction.response.is_done():
             await interaction.response.defer()
@@ -1,4 +1,5 @@
-from typing import List, Optional, TYPE_CHECKING
+import weakref
+from typing import Hashable, List, Optional, TYPE_CHECKING
 
 
 if TYPE_CHECKING:
@@ -6,14 +7,43 @@ if TYPE_CHECKING:
 
 
 class ObservableObject:
+    __slots__ = ('_watch_variables', '_views', '__weakref__')
+
     def __init__(self) -> None:
         self._watch_variables: List[str] = []
-        self.view: Optional['View'] = None
+        # 弱参照で持つため、stopされたViewや参照されなくなったViewは自動的に外れる
+        self._views: 'weakref.WeakSet[View]' = weakref.WeakSet()
+
+    @property
+    def view(self) -> Optional['View']:
+        """
+        結び付けられたViewのうちの一つを返します。複数ある場合はviewsを使ってください。
+        """
+        for view in self._views:
+            return view
+        return None
+
+    @view.setter
+    def view(self, view: Optional['View']) -> None:
+        self._views.clear()
+        if view is not None:
+            self._views.add(view)
+
+    @property
+    def views(self) -> List['View']:
+        return list(self._views)
+
+    def bind(self, view: 'View') -> None:
+        self._views.add(view)
+
+    def unbind(self, view: 'View') -> None:
+        self._views.discard(view)
 
-    def notify(self) -> None:
+    def notify(self, changed: Optional[Hashable] = None) -> None:
         """
         update view
+        :param changed: 変更されたpublishedの識別子。Noneの場合はView全体を更新する
         :return: None
         """
-        if self.view is not None:
-            self.view.update_sync()
+        for view in list(self._views):
+            view.update_sync(changed)
@@ -1,44 +1,137 @@
 from __future__ import annotations
-from typing import Callable, Optional, Type
+import asyncio
+import contextvars
+import functools
+import logging
+from typing import AsyncIterator, Awaitable, Callable, Optional, Type
 
 import discord
 
+from .cache import LRUCache
 from .message import Message
 from .view import View
 from .button import Button
 from .state import state
 
 
+_log = logging.getLogger(__name__)
+
+# 描画中のPaginationViewとページ。先読みはTaskごとにコンテキストが分かれるため、表示中のページと混ざらない
+_rendering_page: contextvars.ContextVar[Optional[tuple[PaginationView, int]]] = \
+    contextvars.ContextVar("rendering_page", default=None)
+
+
 class PaginationButtons:
-    def first(self, now: int, last_page: int) -> Button:
+    # ページ数が分からない場合、last_pageにはNoneが渡されます
+    def first(self, now: int, last_page: Optional[int]) -> Button:
         return Button("<<").style(discord.ButtonStyle.blurple).disabled(now == 0)
 
-    def previous(self, now: int, last_page: int) -> Button:
+    def previous(self, now: int, last_page: Optional[int]) -> Button:
         return Button("<").style(discord.ButtonStyle.green).disabled(now == 0)
 
-    def indicator(self, now: int, last_page: int):
-        return Button(f"{now+1}/{last_page+1}").style(discord.ButtonStyle.gray).disabled(True)
+    def indicator(self, now: int, last_page: Optional[int]):
+        total = "?" if last_page is None else last_page + 1
+        return Button(f"{now+1}/{total}").style(discord.ButtonStyle.gray).disabled(True)
 
-    def next(self, now: int, last_page: int) -> Button:
+    def estimated_indicator(self, now: int, last_page: int):
+        # ページ数が概算の場合にindicatorの代わりに使われます
+        return Button(f"{now+1}/~{last_page+1}").style(discord.ButtonStyle.gray).disabled(True)
+
+    def next(self, now: int, last_page: Optional[int]) -> Button:
         return Button(">").style(discord.ButtonStyle.green).disabled(now == last_page)
 
-    def last(self, now: int, last_page: int) -> Button:
+    def last(self, now: int, last_page: Optional[int]) -> Button:
         return Button(">>").style(discord.ButtonStyle.blurple).disabled(now == last_page)
 
 
+class PageSource:
+    """
+    PaginationViewに表示するPageViewを必要になった時に作成します。
+    countはページ数です。分からない場合はNone、概算の場合はestimatedをTrueにしてください。
+    get_pageが範囲外のページでNoneを返すと、ページ数が確定します。
+    """
+    def __init__(self, count: Optional[int] = None, *, estimated: bool = False) -> None:
+        self.count = count
+        self.estimated = estimated
+
+    async def get_page(self, index: int) -> Optional[PageView]:
+        raise NotImplementedError
+
+
+class CallablePageSource(PageSource):
+    """
+    ページ番号を受け取ってPageViewを返すコルーチン関数からページを作成します。
+    """
+    def __init__(
+            self,
+            func: Callable[[int], Awaitable[Optional[PageView]]],
+            count: Optional[int] = None,
+            *,
+            estimated: bool = False
+    ) -> None:
+        super().__init__(count, estimated=estimated)
+        self.func = func
+
+    async def get_page(self, index: int) -> Optional[PageView]:
+        if index < 0 or (self.count is not None and not self.estimated and index >= self.count):
+            return None
+        return await self.func(index)
+
+
+class IteratorPageSource(PageSource):
+    """
+    PageViewを順番に返す非同期イテレータからページを作成します。
+    factoryは呼ばれるたびに最初から始まるイテレータを返す必要があります。
+    前のページに戻る場合はイテレータを作り直して読み進めるため、保持するのは表示中のページだけです。
+    """
+    def __init__(
+            self,
+            factory: Callable[[], AsyncIterator[PageView]],
+            count: Optional[int] = None,
+            *,
+            estimated: bool = False
+    ) -> None:
+        super().__init__(count, estimated=estimated)
+        self.factory = factory
+        self._iterator: Optional[AsyncIterator[PageView]] = None
+        self._index = -1
+        self._current: Optional[PageView] = None
+        self._lock = asyncio.Lock()
+
+    async def get_page(self, index: int) -> Optional[PageView]:
+        if index < 0:
+            return None
+        async with self._lock:
+            if self._iterator is None or index < self._index:
+                self._iterator = self.factory()
+                self._index = -1
+                self._current = None
+            while self._index < index:
+                try:
+                    self._current = await self._iterator.__anext__()
+                except StopAsyncIteration:
+                    self._iterator = None
+                    return None
+                self._index += 1
+            return self._current
+
+
 class PaginationView(View):
     page = state("page")
 
     def __init__(
             self,
-            views: list[PageView] | PageView,
+            views: list[PageView] | PageView | PageSource,
             *,
             show_buttons: bool = True,
             show_disabled: bool = False,
             show_indicator: bool = True,
             check: Optional[Callable[[discord.Interaction], bool]] = None,
             first_page: int = 0,
-            cls: Type[PaginationButtons] = PaginationButtons
+            cls: Type[PaginationButtons] = PaginationButtons,
+            cache_size: int = 0,
+            cache_ttl: Optional[float] = None,
+            prefetch: bool = False
     ):
         super(PaginationView, self).__init__()
         self._views = views
@@ -48,16 +141,150 @@ class PaginationView(View):
         self.check = check
 
         self.page = first_page  # index 0始まり
-        self.max_page = len(self._views) - 1
+        self.max_page: Optional[int] = self._count_pages()
         self.button_gen = cls()
 
+        # cache_sizeが1以上の場合、描画したページのbodyを保存して再利用する。on_appearは表示するたびに実行される
+        self._page_cache: Optional[LRUCache[tuple[PageView, Message | View]]] = \
+            LRUCache(cache_size, cache_ttl) if cache_size > 0 else None
+        self._prefetch = prefetch
+        self._rendering: dict[int, asyncio.Task] = {}
+
+    @property
+    def rendering_page(self) -> int:
+        """
+        描画中のページを返します。先読みではpageは表示中のページのままなので、PageView.bodyではこちらを使ってください。
+        """
+        rendering = _rendering_page.get()
+        if rendering is not None and rendering[0] is self:
+            return rendering[1]
+        return self.page
+
+    def invalidate(self, page: Optional[int] = None) -> None:
+        """
+        保存されているページの描画結果を破棄します。pageを省略した場合は全て破棄します。
+        """
+        # 先読み中の描画は古い状態を使っているかもしれないので止める
+        for rendering, task in list(self._rendering.items()):
+            if page is None or rendering == page:
+                task.cancel()
+        if self._page_cache is not None:
+            self._page_cache.invalidate(page)
+        if page is None or page == self.page:
+            self.update_sync()
+
+    def _count_pages(self) -> Optional[int]:
+        if isinstance(self._views, PageSource):
+            return None if self._views.count is None else self._views.count - 1
+        if isinstance(self._views, list):
+            return len(self._views) - 1
+        return 0
+
+    async def _get_view(self, page: int) -> Optional[PageView]:
+        if isinstance(self._views, PageSource):
+            view = await self._views.get_page(page)
+            if view is None and (self.max_page is None or page <= self.max_page or self._views.estimated):
+                # 範囲外のページだったので、ページ数を確定させる
+                self._views.count = min(page, self._views.count or page)
+                self._views.estimated = False
+                self.max_page = self._views.count - 1
+            elif view is not None and self._views.estimated and (self.max_page is None or page > self.max_page):
+                # 概算より先のページがあったので、概算を広げる
+                self._views.count = page + 1
+                self.max_page = page
+            return view
+        return self._views[page] if isinstance(self._views, list) else self._views
+
+    def _is_estimated(self) -> bool:
+        return isinstance(self._views, PageSource) and self._views.estimated
+
+    async def _render_page(self, page: int) -> Optional[tuple[PageView, Message | View]]:
+        view = await self._get_view(page)
+        if view is None:
+            return None
+        body = await self._render_body(view, page)
+        if self._page_cache is not None:
+            self._page_cache.put(page, (view, body))
+        return view, body
+
+    async def _render_body(self, view: PageView, page: int) -> Message | View:
+        token = _rendering_page.set((self, page))
+        try:
+            return await view.body(self)
+        finally:
+            _rendering_page.reset(token)
+
+    async def _get_page(self, page: int) -> Optional[Message | View]:
+        """
+        表示するページを描画します。保存されたbodyや先読み中の描画があればそれを使い、on_appearは毎回実行します。
+        """
+        view: Optional[PageView]
+        cached = self._page_cache.get(page) if self._page_cache is not None else None
+        if cached is not None:
+            view, body = cached
+            await view.on_appear(self)
+            return body
+
+        task = self._rendering.get(page)
+        if task is not None:
+            await asyncio.wait((task,))
+            # invalidateで止められた先読みは使わずに描画し直す
+            if not task.cancelled():
+                rendered = task.result()
+                if rendered is None:
+                    return None
+                view, body = rendered
+                await view.on_appear(self)
+                return body
+
+        view = await self._get_view(page)
+        if view is None:
+            return None
+        await view.on_appear(self)
+        body = await self._render_body(view, page)
+        if self._page_cache is not None:
+            self._page_cache.put(page, (view, body))
+        return body
+
+    def _prefetch_pages(self) -> None:
+        # PageViewが一つだけの場合は表示中のページでしか描画できないため先読みしない
+        if not self._prefetch or self._page_cache is None or isinstance(self._views, PageView):
+            return
+        pages = [self.page + 1]
+        # IteratorPageSourceで前のページに戻るにはイテレータを最初から読み直すため、先読みしない
+        if not isinstance(self._views, IteratorPageSource):
+            pages.append(self.page - 1)
+        for page in pages:
+            if page < 0 or (self.max_page is not None and page > self.max_page and not self._is_estimated()):
+                continue
+            if page not in self._page_cache and page not in self._rendering:
+                task = self._rendering[page] = self.loop.create_task(self._render_page(page))
+                task.add_done_callback(functools.partial(self._prefetch_done, page))
+
+    def _prefetch_done(self, page: int, task: asyncio.Task) -> None:
+        if self._rendering.get(page) is task:
+            del self._rendering[page]
+        if not task.cancelled() and task.exception() is not None:
+            _log.error("failed to prefetch page %d", page, exc_info=task.exception())
+
     def change_page(self, interaction: discord.Interaction, page: int):
         if self.check is not None and not self.check(interaction):
             return
         self.page = page
 
     async def body(self) -> Message | View:
-        view = self._views[self.page] if isinstance(self._views, list) else self._views
+        page_body = await self._get_page(self.page)
+        while page_body is None:
+            # ページ数が確定して表示中のページが範囲外になった
+            if self.max_page is None or self.max_page < 0:
+                raise IndexError("page source has no pages")
+            self.page = self.max_page
+            page_body = await self._get_page(self.page)
+
+        # ページ数が概算の間は、最後のページが分からないものとしてボタンを作る
+        estimated = self._is_estimated()
+        known_last = None if estimated else self.max_page
+
         buttons = []
         first = self.button_gen.first(self.page, self.max_page)
         if not (not self.show_disabled and getattr(first, "_disabled", False)):
@@ -68,20 +295,25 @@ class PaginationView(View):
             buttons.append(prev.on_click(lambda x: self.change_page(x, self.page - 1)))
 
         if self.show_indicator:
-            indicator = self.button_gen.indicator(self.page, self.max_page)
+            if estimated and self.max_page is not None:
+                indicator = self.button_gen.estimated_indicator(self.page, self.max_page)
+            else:
+                indicator = self.button_gen.indicator(self.page, self.max_page)
             buttons.append(indicator)
 
-        next_ = self.button_gen.next(self.page, self.max_page)
+        next_ = self.button_gen.next(self.page, known_last)
         if not (not self.show_disabled and getattr(next_, "_disabled", False)):
             buttons.append(next_.on_click(lambda x: self.change_page(x, self.page + 1)))
 
-        last = self.button_gen.last(self.page, self.max_page)
-        if not (not self.show_disabled and getattr(last, "_disabled", False)):
-            buttons.append(last.on_click(lambda x: self.change_page(x, self.max_page)))
+        last = self.button_gen.last(self.page, known_last)
+        # 概算の場合は、概算した最後のページがまだ先にある時だけ移動できる
+        last_page = self.max_page if not estimated or (self.max_page or 0) > self.page else None
+        if last_page is not None and not (not self.show_disabled and getattr(last, "_disabled", False)):
+            buttons.append(last.on_click(lambda x: self.change_page(x, last_page)))
 
-        await view.on_appear(self)
-        body = await view.body(self)
+        body = page_body.copy()
         body.items([buttons])
+        self._prefetch_pages()
 
         return body
 
@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Hashable, Optional
+
+import discord
+
+from .view import View
+from .tracker import ViewTracker
+from .provider import MessageProvider
+from .registry import TrackerRegistry, default_registry
+from .observable_object import ObservableObject
+from .utils import _load_field, _store_field, _format_custom_id, _FieldProperty, _MISSING
+
+_log = logging.getLogger(__name__)
+
+
+class ViewStore:
+    """
+    PersistentViewの状態を保存する場所です。
+    """
+    def save(self, key: str, name: str, data: dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def load(self, key: str) -> Optional[tuple[str, dict[str, Any]]]:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+
+class SQLiteViewStore(ViewStore):
+    """
+    sqliteに状態を保存します。値はjsonに変換できる必要があります。
+    dumps/loadsを差し替えると他の形式で保存できます。
+    保存はイベントループとは別のスレッドから行われます。
+    """
+    def __init__(
+            self,
+            path: str = ":memory:",
+            *,
+            dumps: Callable[[Any], str] = json.dumps,
+            loads: Callable[[str], Any] = json.loads
+    ) -> None:
+        self.dumps = dumps
+        self.loads = loads
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS views (key TEXT PRIMARY KEY, name TEXT NOT NULL, data TEXT NOT NULL, updated REAL NOT NULL)"
+            )
+
+    def save(self, key: str, name: str, data: dict[str, Any]) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO views (key, name, data, updated) VALUES (?, ?, ?, ?)",
+                (key, name, self.dumps(data), time.time())
+            )
+
+    def load(self, key: str) -> Optional[tuple[str, dict[str, Any]]]:
+        with self._lock:
+            row = self._connection.execute("SELECT name, data FROM views WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return row[0], self.loads(row[1])
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM views WHERE key = ?", (key,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+_view_classes: dict[str, type[PersistentView]] = {}
+# メモリ上に存在するPersistentView
+_live_views: weakref.WeakValueDictionary[str, PersistentView] = weakref.WeakValueDictionary()
+_class_fields: dict[type, dict[str, str]] = {}
+# storeへの読み書きを行うスレッド。一つだけにして、保存と削除が呼んだ順に行われるようにする
+_store_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _run_store(func: Callable[..., Any], *args: Any) -> asyncio.Future:
+    """
+    storeの処理をイベントループを止めずに実行します。処理は呼ばれた順に一つずつ行われます。
+    """
+    global _store_executor
+    if _store_executor is None:
+        _store_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="discord-ext-ui-store")
+    return asyncio.get_event_loop().run_in_executor(_store_executor, func, *args)
+
+
+def _store_done(future: asyncio.Future) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        _log.error("failed to access the view store", exc_info=future.exception())
+
+
+def _fields_of(cls: type) -> dict[str, str]:
+    """
+    クラスに定義されたstate/publishedの、属性名と保存先の名前の組を返します。
+    """
+    fields = _class_fields.get(cls)
+    if fields is None:
+        fields = {}
+        for klass in reversed(cls.__mro__):
+            for attr, value in vars(klass).items():
+                if isinstance(value, _FieldProperty):
+                    fields[attr] = value._field_name
+        _class_fields[cls] = fields
+    return fields
+
+
+def _dump_fields(obj: Any) -> dict[str, Any]:
+    data = {}
+    for attr, name in _fields_of(type(obj)).items():
+        value = _load_field(obj, name)
+        if value is not _MISSING:
+            data[attr] = value
+    return data
+
+
+def _load_fields(obj: Any, data: dict[str, Any]) -> None:
+    fields = _fields_of(type(obj))
+    for attr, value in data.items():
+        if attr in fields:
+            # 復元中は再描画しないよう、setterを通さずに書き込む
+            _store_field(obj, fields[attr], value)
+
+
+class PersistentView(View):
+    """
+    state/publishedの値をstoreに保存し、メモリから追い出された後も操作できるViewです。
+    コンポーネントのcustom_idは`prefix:key:item`の形で決まり、
+    PersistentViewManagerが操作されたViewを復元します。
+    復元時には引数なしで生成されるため、__init__は引数なしで呼べる必要があります。
+    """
+    store: Optional[ViewStore] = None
+    custom_id_prefix: str = "ui"
+    persistent_name: str = "PersistentView"
+
+    def __init_subclass__(cls, name: Optional[str] = None, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.persistent_name = name or f"{cls.__module__}.{cls.__qualname__}"
+        _view_classes[cls.persistent_name] = cls
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None, *, key: Optional[str] = None):
+        super().__init__(loop)
+        self.persistent_key: str = key or uuid.uuid4().hex
+        self._unsaved: bool = True
+        # 最後に依頼したstoreへの書き込み
+        self._store_future: Optional[asyncio.Future] = None
+        _live_views[self.persistent_key] = self
+
+    @classmethod
+    def restore(cls, key: str, data: dict[str, Any]) -> PersistentView:
+        view = cls()
+        _live_views.pop(view.persistent_key, None)
+        view.persistent_key = key
+        view.load_state(data)
+        view._unsaved = False
+        _live_views[key] = view
+        return view
+
+    def dump_state(self) -> dict[str, Any]:
+        """
+        保存する値を返します。ObservableObjectの属性はpublishedの値が保存されます。
+        """
+        objects = {
+            attr: _dump_fields(value)
+            for attr, value in vars(self).items()
+            if isinstance(value, ObservableObject)
+        }
+        return {"fields": _dump_fields(self), "objects": objects}
+
+    def load_state(self, data: dict[str, Any]) -> None:
+        _load_fields(self, data.get("fields", {}))
+        for attr, fields in data.get("objects", {}).items():
+            obj = getattr(self, attr, None)
+            if isinstance(obj, ObservableObject):
+                _load_fields(obj, fields)
+
+    def update_sync(self, changed: Optional[Hashable] = None):
+        self._unsaved = True
+        super().update_sync(changed)
+
+    def stop(self):
+        if self.store is not None:
+            self._store_future = _run_store(self.store.delete, self.persistent_key)
+            self._store_future.add_done_callback(_store_done)
+        super().stop()
+
+    def _component_id(self, key: Hashable) -> Optional[str]:
+        return _format_custom_id(self.custom_id_prefix, self.persistent_key, key)
+
+    def _checkpoint(self) -> None:
+        if self._unsaved and self.store is not None:
+            # 値はここで取り出し、書き込みだけを別のスレッドで行う
+            self._store_future = _run_store(self.store.save, self.persistent_key, self.persistent_name, self.dump_state())
+            self._store_future.add_done_callback(_store_done)
+            self._unsaved = False
+
+    def _evict(self) -> None:
+        # 状態を保存してメモリから外す。on_disappearは呼ばない
+        self._checkpoint()
+        if self._update_handle is not None:
+            self._update_handle.cancel()
+            self._update_handle = None
+        tracker, self._tracker = self._tracker, None
+        if tracker is not None:
+            tracker.stop()
+
+
+class PersistentViewManager:
+    """
+    メモリ上にないPersistentViewのコンポーネントが操作された時に、storeから復元して処理します。
+    on_interactionイベントからon_interactionを呼んでください。
+    """
+    def __init__(
+            self,
+            client: discord.Client,
+            store: Optional[ViewStore] = None,
+            *,
+            registry: Optional[TrackerRegistry] = None,
+            prefix: str = PersistentView.custom_id_prefix
+    ) -> None:
+        self.client = client
+        self.store: Optional[ViewStore] = store if store is not None else PersistentView.store
+        self.registry: TrackerRegistry = registry if registry is not None else default_registry
+        self.prefix = prefix
+        # 復元中のViewのキーと、その復元を行っているTask
+        self._restoring: dict[str, asyncio.Task[Optional[ViewTracker]]] = {}
+
+    def parse(self, custom_id: str) -> Optional[str]:
+        """
+        custom_idからViewのキーを取り出します。このManagerのものでなければNoneを返します。
+        """
+        parts = custom_id.split(":", 2)
+        if len(parts) != 3 or parts[0] != self.prefix:
+            return None
+        return parts[1]
+
+    async def on_interaction(self, interaction: discord.Interaction) -> bool:
+        """
+        Viewを復元して処理した場合はTrueを返します。
+        """
+        if interaction.type is not discord.InteractionType.component or interaction.message is None:
+            return False
+        if interaction.data is None or not isinstance(interaction.channel, discord.abc.Messageable):
+            return False
+        custom_id = str(interaction.data.get("custom_id", ""))
+        key = self.parse(custom_id)
+        if key is None or self.store is None:
+            return False
+
+        # 復元中に届いた操作は、その復元を待ってから復元されたViewに渡す
+        task = self._restoring.get(key)
+        if task is None:
+            live = _live_views.get(key)
+            if live is not None and live._tracker is not None and not live._tracker.is_finished():
+                # メモリ上にあるViewはdiscord.pyが処理する
+                return False
+            task = asyncio.ensure_future(self._restore(key, interaction))
+            self._restoring[key] = task
+            task.add_done_callback(functools.partial(self._restore_done, key))
+        tracker = await asyncio.shield(task)
+        if tracker is None:
+            return False
+
+        for item in tracker.children:
+            if getattr(item, "custom_id", None) == custom_id:
+                tracker._dispatch_item(item, interaction)
+                return True
+        return False
+
+    async def _restore(self, key: str, interaction: discord.Interaction) -> Optional[ViewTracker]:
+        assert interaction.message is not None
+        assert isinstance(interaction.channel, discord.abc.Messageable)
+        # 書き込みと同じスレッドで読み、それまでに依頼された保存を反映した値を得る
+        loaded = await _run_store(self.store.load, key) if self.store is not None else None
+        if loaded is None:
+            return None
+        name, data = loaded
+        cls = _view_classes.get(name)
+        if cls is None:
+            return None
+
+        view = cls.restore(key, data)
+        view.store = self.store
+        tracker = ViewTracker(view, timeout=None, registry=self.registry)
+        provider = MessageProvider(interaction.channel)
+        provider.message = interaction.message
+        await tracker.attach(provider, interaction.message)
+        self.client.add_view(tracker, message_id=interaction.message.id)
+        return tracker
+
+    def _restore_done(self, key: str, task: asyncio.Task[Optional[ViewTracker]]) -> None:
+        if self._restoring.get(key) is task:
+            del self._restoring[key]
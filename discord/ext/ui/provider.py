@@ -1,56 +1,152 @@
 from __future__ import annotations
+import asyncio
 from typing import Optional
 
 import discord
 from discord import ui
 
+from .ratelimit import EditQueue, default_edit_queue
+
 
 class BaseProvider:
-    async def send_message(self, content: Optional[str], embeds: list[discord.Embed], view: ui.View) -> discord.Message:
+    def __init__(self, edit_queue: Optional[EditQueue] = None) -> None:
+        self.pending_interaction: Optional[discord.Interaction] = None
+        self.edit_queue: EditQueue = edit_queue or default_edit_queue
+        self._response_lock = asyncio.Lock()
+
+    @property
+    def channel_id(self) -> Optional[int]:
+        return None
+
+    @property
+    def guild_id(self) -> Optional[int]:
+        return None
+
+    @property
+    def user_id(self) -> Optional[int]:
+        return None
+
+    async def send_message(self, content: Optional[str], embeds: list[discord.Embed], view: ui.View) -> Optional[discord.Message]:
         pass
 
-    async def edit_message(self, content: Optional[str], embeds: list[discord.Embed], view: ui.View) -> discord.Message:
+    async def edit_message(self, content: Optional[str], embeds: list[discord.Embed], view: ui.View) -> Optional[discord.Message]:
         pass
 
-    def update_interaction(self, interaction: discord.Interaction):
+    async def get_message(self) -> Optional[discord.Message]:
+        """
+        送信したメッセージを返します。send_messageがメッセージを返さなかった場合に使います。
+        """
         pass
 
+    def update_interaction(self, interaction: discord.Interaction):
+        self.pending_interaction = interaction
+
+    async def respond_with_edit(self, content: Optional[str], embeds: list[discord.Embed], view: ui.View) -> bool:
+        """
+        まだ応答していないコンポーネントのinteractionがあれば、その応答としてメッセージを編集します。
+        編集できた場合はTrueを返します。
+        """
+        interaction = self.pending_interaction
+        if interaction is None or interaction.type not in (
+                discord.InteractionType.component, discord.InteractionType.modal_submit):
+            return False
+        async with self._response_lock:
+            if interaction.response.is_done():
+                return False
+            await interaction.response.edit_message(content=content, embeds=embeds, view=view)
+            return True
+
+    async def acknowledge(self, interaction: discord.Interaction) -> None:
+        async with self._response_lock:
+            if not interaction.response.is_done():
+                await interaction.response.defer()
+
 
 class MessageProvider(BaseProvider):
-    def __init__(self, channel: discord.TextChannel) -> None:
+    def __init__(self, channel: discord.abc.MessageableChannel, edit_queue: Optional[EditQueue] = None) -> None:
+        super().__init__(edit_queue)
         self.channel = channel
         self.message: Optional[discord.Message] = None
 
-    async def send_message(self, content: Optional[str], embeds: list[discord.Embed], view: ui.View) -> discord.Message:
+    @property
+    def channel_id(self) -> Optional[int]:
+        return self.channel.id
+
+    @property
+    def guild_id(self) -> Optional[int]:
+        guild = getattr(self.channel, "guild", None)
+        return guild.id if guild is not None else None
+
+    async def send_message(self, content: Optional[str], embeds: list[discord.Embed], view: ui.View) -> Optional[discord.Message]:
         self.message = await self.channel.send(content, embeds=embeds, view=view)
         return self.message
 
-    async def edit_message(self, content: Optional[str], embeds: list[discord.Embed], view: ui.View) -> discord.Message:
-        await self.message.edit(content=content, embeds=embeds, view=view)
+    async def edit_message(self, content: Optional[str], embeds: list[discord.Embed], view: ui.View) -> Optional[discord.Message]:
+        if await self.respond_with_edit(content, embeds, view):
+            return self.message
+        await self.edit_queue.submit(
+            self.channel.id,
+            self,
+            lambda: self.message.edit(content=content, embeds=embeds, view=view)
+        )
+        return self.message
+
+    async def get_message(self) -> Optional[discord.Message]:
         return self.message
 
 
 class InteractionProvider(BaseProvider):
-    def __init__(self, interaction: discord.Interaction, *args, **kwargs) -> None:
+    def __init__(self, interaction: discord.Interaction, *args, edit_queue: Optional[EditQueue] = None, **kwargs) -> None:
+        super().__init__(edit_queue)
         self.interaction = interaction
+        # 応答の結果からメッセージが分からない場合はNoneになります。その場合はget_messageで取得してください
         self.message: Optional[discord.Message] = None
         self._args = args
         self._kwargs = kwargs
 
-    async def send_message(self, content: Optional[str], embeds: list[discord.Embed], view: ui.View) -> discord.Message:
+    @property
+    def channel_id(self) -> Optional[int]:
+        return self.interaction.channel_id
+
+    @property
+    def guild_id(self) -> Optional[int]:
+        return self.interaction.guild_id
+
+    @property
+    def user_id(self) -> Optional[int]:
+        return self.interaction.user.id
+
+    async def get_message(self) -> Optional[discord.Message]:
+        """
+        送信したメッセージを返します。まだ分かっていない場合のみoriginal_messageで取得し、以降はそれを使います。
+        """
+        if self.message is None:
+            self.message = await self.interaction.original_message()
+        return self.message
+
+    async def send_message(self, content: Optional[str], embeds: list[discord.Embed], view: ui.View) -> Optional[discord.Message]:
         resp: discord.InteractionResponse = self.interaction.response
         if resp._responded:
             followup: discord.Webhook = self.interaction.followup
             self.message = await followup.send(content, embeds=embeds, view=view, wait=True, *self._args, **self._kwargs)
         else:
-            await resp.send_message(content, embeds=embeds, view=view, *self._args, **self._kwargs)
-            self.message = await self.interaction.original_message()
+            callback = await resp.send_message(content, embeds=embeds, view=view, *self._args, **self._kwargs)
+            # 応答の結果に送信したメッセージが含まれていればそれを使う。含まれていなければget_messageで取得する
+            resource = getattr(callback, "resource", None)
+            self.message = resource if isinstance(resource, discord.Message) else None
         return self.message
 
-    async def edit_message(self, content: Optional[str], embeds: list[discord.Embed], view: ui.View) -> discord.InteractionMessage:
-        await self.interaction.edit_original_message(content=content, embeds=embeds, view=view)
-        self.message = await self.interaction.original_message()
+    async def edit_message(self, content: Optional[str], embeds: list[discord.Embed], view: ui.View) -> Optional[discord.Message]:
+        if await self.respond_with_edit(content, embeds, view):
+            self.message = self.interaction.message or self.message
+            return self.message
+        self.message = await self.edit_queue.submit(
+            self.interaction.channel_id,
+            self,
+            lambda: self.interaction.edit_original_message(content=content, embeds=embeds, view=view)
+        )
         return self.message
 
     def update_interaction(self, interaction: discord.Interaction):
+        super().update_interaction(interaction)
         self.interaction = interaction
@@ -1,18 +1,40 @@
 from __future__ import annotations
-from typing import Any, TypeVar
+import operator
+from typing import Any, Callable, Optional, TypeVar
 
 from .observable_object import ObservableObject
+from .utils import Comparator, _make_comparator, _has_changed, _load_field, _store_field, _MISSING, _record_read, _field_key, \
+    _FieldProperty
 
 T = TypeVar('T')
 
 
-def published(name: str):
+def published(
+        name: str,
+        compare: Optional[Comparator] = operator.eq,
+        *,
+        key: Optional[Callable[[Any], Any]] = None
+):
+    """
+    値が変更された時にObservableObjectのnotifyを呼ぶプロパティを作成します。
+    比較方法はstateと同じです。
+    __slots__を使うクラスでは、値は`_<name>_value`というslotに保存されます。
+    """
+    compare = _make_comparator(compare, key)
+
     def getter(instance: T) -> Any:
-        return instance.__dict__[name]
+        _record_read(instance, name)
+        value = _load_field(instance, name)
+        if value is _MISSING:
+            raise AttributeError(name)
+        return value
 
     def setter(instance: T, value: Any) -> None:
-        instance.__dict__[name] = value
-        if isinstance(instance, ObservableObject):
-            instance.notify()
+        changed = _has_changed(_load_field(instance, name), value, compare)
+        _store_field(instance, name, value)
+        if changed and isinstance(instance, ObservableObject):
+            instance.notify(_field_key(instance, name))
 
-    return property(getter, setter)
+    field = _FieldProperty(getter, setter)
+    field._field_name = name
+    return field
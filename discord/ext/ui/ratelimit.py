@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+
+class TokenBucket:
+    def __init__(self, rate: int, per: float) -> None:
+        self.rate = rate
+        self.per = per
+        self.tokens: float = float(rate)
+        self.updated: float = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(float(self.rate), self.tokens + (now - self.updated) * self.rate / self.per)
+        self.updated = now
+
+    def is_full(self) -> bool:
+        self._refill()
+        return self.tokens >= self.rate
+
+    def delay(self) -> float:
+        """
+        次のトークンが使えるようになるまでの秒数を返します。
+        """
+        self._refill()
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) * self.per / self.rate
+
+    def try_consume(self) -> bool:
+        """
+        待っている編集がなく、すぐに使えるトークンがあれば消費してTrueを返します。
+        """
+        if self._lock.locked() or self.delay() > 0:
+            return False
+        self.tokens -= 1
+        return True
+
+    async def acquire(self) -> None:
+        # 待っている順にトークンを渡す
+        async with self._lock:
+            while True:
+                delay = self.delay()
+                if delay <= 0:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep(delay)
+
+
+class _PendingEdit:
+    def __init__(self, edit: Callable[[], Awaitable[Any]], future: asyncio.Future) -> None:
+        self.edit = edit
+        self.future = future
+
+
+class EditQueue:
+    """
+    チャンネルごとのトークンバケットでメッセージの編集回数を制限します。
+    待機中の編集は同じメッセージへの新しい編集で置き換えられ、最新の内容だけが送信されます。
+    """
+    max_idle_buckets: int = 1024
+
+    def __init__(self, rate: int = 5, per: float = 5.0) -> None:
+        self.rate = rate
+        self.per = per
+        self._buckets: dict[Hashable, TokenBucket] = {}
+        self._pending: dict[Hashable, _PendingEdit] = {}
+
+    def bucket(self, channel_key: Hashable) -> TokenBucket:
+        bucket = self._buckets.get(channel_key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_idle_buckets:
+                self._buckets = {key: b for key, b in self._buckets.items() if not b.is_full()}
+            bucket = self._buckets[channel_key] = TokenBucket(self.rate, self.per)
+        return bucket
+
+    async def submit(
+            self,
+            channel_key: Optional[Hashable],
+            message_key: Hashable,
+            edit: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        pending = self._pending.get(message_key)
+        if pending is not None:
+            pending.edit = edit
+            return await asyncio.shield(pending.future)
+
+        bucket = self.bucket(channel_key)
+        if bucket.try_consume():
+            return await edit()
+
+        pending = _PendingEdit(edit, asyncio.get_running_loop().create_future())
+        self._pending[message_key] = pending
+        asyncio.get_running_loop().create_task(self._run(bucket, message_key, pending))
+        return await asyncio.shield(pending.future)
+
+    async def _run(self, bucket: TokenBucket, message_key: Hashable, pending: _PendingEdit) -> None:
+        try:
+            await bucket.acquire()
+        finally:
+            del self._pending[message_key]
+        try:
+            result = await pending.edit()
+        except Exception as e:
+            pending.future.set_exception(e)
+        else:
+            pending.future.set_result(result)
+
+
+default_edit_queue = EditQueue()
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Optional, TYPE_CHECKING
+
+import discord
+from discord import ui
+
+from .provider import BaseProvider
+
+if TYPE_CHECKING:
+    from .tracker import ViewTracker
+
+
+class TrackerRegistry:
+    """
+    表示中のViewTrackerをメッセージ、チャンネル、ユーザー、サーバーごとに管理します。
+    max_trackersを超えた場合や、idle_timeout秒操作されなかった場合は、古いものからViewをstopします。
+    idle_timeoutを過ぎたものは、新しい登録や操作がなくても期限が来た時点でstopされます。
+    PersistentViewはstopせずに状態を保存してメモリから外します。
+    """
+    def __init__(self, max_trackers: Optional[int] = None, idle_timeout: Optional[float] = None) -> None:
+        self.max_trackers = max_trackers
+        self.idle_timeout = idle_timeout
+        self._trackers: OrderedDict[ViewTracker, float] = OrderedDict()
+        self._by_message: dict[int, ViewTracker] = {}
+        self._by_channel: dict[int, set[ViewTracker]] = {}
+        self._by_user: dict[int, set[ViewTracker]] = {}
+        self._by_guild: dict[int, set[ViewTracker]] = {}
+        self._keys: dict[ViewTracker, tuple[Optional[int], Optional[int], Optional[int], Optional[int]]] = {}
+        self._sweep_handle: Optional[asyncio.TimerHandle] = None
+
+    def __len__(self) -> int:
+        return len(self._trackers)
+
+    def __contains__(self, tracker: ViewTracker) -> bool:
+        return tracker in self._trackers
+
+    def register(self, tracker: ViewTracker) -> None:
+        provider = tracker.provider
+        message_id = tracker.message.id if tracker.message is not None else None
+        channel_id = provider.channel_id if provider is not None else None
+        user_id = provider.user_id if provider is not None else None
+        guild_id = provider.guild_id if provider is not None else None
+
+        self.unregister(tracker)
+        self._trackers[tracker] = time.monotonic()
+        self._keys[tracker] = (message_id, channel_id, user_id, guild_id)
+        if message_id is not None:
+            self._by_message[message_id] = tracker
+        for index, key in ((self._by_channel, channel_id), (self._by_user, user_id), (self._by_guild, guild_id)):
+            if key is not None:
+                index.setdefault(key, set()).add(tracker)
+        self.sweep()
+        self._schedule_sweep()
+
+    def set_message(self, tracker: ViewTracker, message: discord.Message) -> None:
+        """
+        送信後にメッセージが分かった場合に、メッセージIDで引けるようにします。
+        """
+        keys = self._keys.get(tracker)
+        if keys is None or keys[0] == message.id:
+            return
+        if keys[0] is not None:
+            self._by_message.pop(keys[0], None)
+        self._keys[tracker] = (message.id, *keys[1:])
+        self._by_message[message.id] = tracker
+
+    def unregister(self, tracker: ViewTracker) -> None:
+        if self._trackers.pop(tracker, None) is None:
+            return
+        message_id, channel_id, user_id, guild_id = self._keys.pop(tracker)
+        if message_id is not None and self._by_message.get(message_id) is tracker:
+            del self._by_message[message_id]
+        for index, key in ((self._by_channel, channel_id), (self._by_user, user_id), (self._by_guild, guild_id)):
+            if key is None:
+                continue
+            trackers = index.get(key)
+            if trackers is not None:
+                trackers.discard(tracker)
+                if not trackers:
+                    del index[key]
+
+    def touch(self, tracker: ViewTracker) -> None:
+        if tracker in self._trackers:
+            self._trackers[tracker] = time.monotonic()
+            self._trackers.move_to_end(tracker)
+            self.sweep()
+
+    def get(self, message_id: int) -> Optional[ViewTracker]:
+        return self._by_message.get(message_id)
+
+    def by_channel(self, channel_id: int) -> list[ViewTracker]:
+        return list(self._by_channel.get(channel_id, ()))
+
+    def by_user(self, user_id: int) -> list[ViewTracker]:
+        return list(self._by_user.get(user_id, ()))
+
+    def by_guild(self, guild_id: int) -> list[ViewTracker]:
+        return list(self._by_guild.get(guild_id, ()))
+
+    def evict(self, tracker: ViewTracker) -> None:
+        self.unregister(tracker)
+        tracker.view._evict()
+
+    def sweep(self) -> None:
+        """
+        操作されていない期間がidle_timeoutを超えたものと、max_trackersを超えた分を古い順にstopします。
+        """
+        if self.idle_timeout is not None:
+            deadline = time.monotonic() - self.idle_timeout
+            while self._trackers:
+                tracker, last_active = next(iter(self._trackers.items()))
+                if last_active > deadline:
+                    break
+                self.evict(tracker)
+        if self.max_trackers is not None:
+            while len(self._trackers) > self.max_trackers:
+                self.evict(next(iter(self._trackers)))
+
+    def _schedule_sweep(self) -> None:
+        # 一番古いTrackerの期限が来た時にsweepする。期限はtouchで延びるため、その時点で次を予約し直す
+        if self.idle_timeout is None or self._sweep_handle is not None or not self._trackers:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        last_active = next(iter(self._trackers.values()))
+        delay = max(0.0, last_active + self.idle_timeout - time.monotonic())
+        self._sweep_handle = loop.call_later(delay, self._run_sweep)
+
+    def _run_sweep(self) -> None:
+        self._sweep_handle = None
+        self.sweep()
+        self._schedule_sweep()
+
+    def stop_channel(self, channel_id: int) -> None:
+        for tracker in self.by_channel(channel_id):
+            self.evict(tracker)
+
+    def stop_guild(self, guild_id: int) -> None:
+        for tracker in self.by_guild(guild_id):
+            self.evict(tracker)
+
+    def estimate_memory(self, tracker: ViewTracker) -> int:
+        """
+        View、最後の描画結果、discordのItemが使っているおおよそのメモリ(バイト)を返します。
+        """
+        seen: set[int] = set()
+        return _sizeof(tracker.view, seen) + _sizeof(tracker.body, seen) + _sizeof(tracker.children, seen)
+
+
+# 中身まで辿らないオブジェクト
+_OPAQUE = (
+    asyncio.AbstractEventLoop, asyncio.Handle, discord.Client, discord.Interaction, discord.Message,
+    ui.View, BaseProvider,
+)
+
+
+def _sizeof(obj: Any, seen: set[int], depth: int = 6) -> int:
+    if id(obj) in seen or depth < 0:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, _OPAQUE):
+        return size
+
+    if isinstance(obj, dict):
+        return size + sum(_sizeof(k, seen, depth - 1) + _sizeof(v, seen, depth - 1) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return size + sum(_sizeof(v, seen, depth - 1) for v in obj)
+    if hasattr(obj, "__dict__"):
+        size += _sizeof(obj.__dict__, seen, depth - 1)
+    for cls in type(obj).__mro__:
+        slots = getattr(cls, "__slots__", ())
+        for name in (slots,) if isinstance(slots, str) else slots:
+            if name not in ("__dict__", "__weakref__"):
+                size += _sizeof(getattr(obj, name, None), seen, depth - 1)
+    return size
+
+
+default_registry = TrackerRegistry()
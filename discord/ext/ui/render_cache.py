@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Hashable, Optional, TYPE_CHECKING
+
+from .cache import LRUCache
+from .message import Message
+
+if TYPE_CHECKING:
+    from .view import View
+
+
+class _SharedRender:
+    __slots__ = ('version', 'body', 'body_version', 'task', 'task_version')
+
+    def __init__(self) -> None:
+        self.version: int = 0
+        self.body: Optional[Message] = None
+        self.body_version: int = -1
+        self.task: Optional[asyncio.Task] = None
+        self.task_version: int = -1
+
+
+class RenderCache:
+    """
+    render_keyが同じViewの描画結果を共有します。
+    キーごとに、変更があってから最初に描画したViewのbodyだけが実行され、他のViewはその結果を使います。
+    共有されたメッセージの編集はmax_concurrent_edits件まで同時に行います。
+    """
+    def __init__(self, maxsize: int = 1024, max_concurrent_edits: int = 10) -> None:
+        self.max_concurrent_edits = max_concurrent_edits
+        self._entries: LRUCache[_SharedRender] = LRUCache(maxsize)
+        self._edit_semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def edit_semaphore(self) -> asyncio.Semaphore:
+        # イベントループの中で作るため、最初に使われた時に作る
+        if self._edit_semaphore is None:
+            self._edit_semaphore = asyncio.Semaphore(self.max_concurrent_edits)
+        return self._edit_semaphore
+
+    def invalidate(self, key: Hashable) -> None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.version += 1
+
+    async def render(self, view: View) -> Message:
+        key = view.render_key
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = _SharedRender()
+            self._entries.put(key, entry)
+        if entry.body is not None and entry.body_version == entry.version:
+            return entry.body
+
+        if entry.task is None or entry.task_version != entry.version:
+            entry.task = view.loop.create_task(view._render_chain())
+            entry.task_version = entry.version
+        version, task = entry.task_version, entry.task
+        try:
+            # 待っている側がキャンセルされても、他のViewが使う描画は続ける
+            body = await asyncio.shield(task)
+        except Exception:
+            if entry.task is task:
+                entry.task = None
+            raise
+        if entry.version == version:
+            entry.body, entry.body_version = body, version
+        return body
+
+
+default_render_cache = RenderCache()
@@ -6,9 +6,15 @@ from discord import ui
 
 from .item import Item
 from .custom import CustomSelect
+from .spec import SelectSpec, SelectOptionSpec, intern_spec
 
 
 class Select(Item):
+    __slots__ = (
+        '_placeholder', '_min_values', '_max_values', '_options', '_disabled', '_row', '_custom_id',
+        'func', 'check_func', '_spec',
+    )
+
     def __init__(
             self,
             placeholder: Optional[str] = None,
@@ -28,25 +34,31 @@ class Select(Item):
 
         self.func: Optional[Callable] = None
         self.check_func: Optional[Callable[[discord.Interaction], bool]] = None
+        self._spec: Optional[SelectSpec] = None
 
     def placeholder(self, placeholder: str) -> 'Select':
         self._placeholder = placeholder
+        self._spec = None
         return self
 
     def min_values(self, min_values: int) -> 'Select':
         self._min_values = min_values
+        self._spec = None
         return self
 
     def max_values(self, max_values: int) -> 'Select':
         self._max_values = max_values
+        self._spec = None
         return self
 
     def options(self, options: list[SelectOption]) -> 'Select':
         self._options = [op.to_discord_select_option() for op in options]
+        self._spec = None
         return self
     
     def disabled(self, disabled: bool = False) -> 'Select':
         self._disabled = disabled
+        self._spec = None
         return self
 
     def row(self, row: int) -> 'Select':
@@ -60,14 +72,27 @@ class Select(Item):
 
     def custom_id(self, custom_id: str) -> 'Select':
         self._custom_id = custom_id
+        self._spec = None
         return self
 
     def check(self, func: Callable[[discord.Interaction], bool]) -> 'Select':
         self.check_func = func
         return self
 
+    def spec(self) -> SelectSpec:
+        if self._spec is None:
+            self._spec = intern_spec(SelectSpec(
+                self._placeholder,
+                self._min_values,
+                self._max_values,
+                tuple(_option_spec(option) for option in self._options),
+                self._disabled,
+                self._custom_id,
+            ))
+        return self._spec
+
     def to_discord_item(self, row: Optional[int]) -> ui.Item:
-        return CustomSelect(
+        select = CustomSelect(
             custom_id=self._custom_id,
             placeholder=self._placeholder,
             min_values=self._min_values,
@@ -78,9 +103,37 @@ class Select(Item):
             callback=self.func,
             check_func=self.check_func,
         )
+        select._spec = self.spec()
+        return select
+
+    def update_discord_item(self, item: ui.Item) -> bool:
+        if not isinstance(item, CustomSelect):
+            return False
+        spec = self.spec()
+        if item._spec is not spec:
+            if self._custom_id is not None:
+                item.custom_id = self._custom_id
+            item.placeholder = self._placeholder
+            item.min_values = self._min_values
+            item.max_values = self._max_values
+            item.options = self._options
+            item.index_options()
+            item.disabled = self._disabled
+            item._spec = spec
+        item.callback_func = self.func
+        item.check_func = self.check_func
+        return True
+
+
+def _option_spec(option: Union[discord.SelectOption, SelectOption]) -> SelectOptionSpec:
+    if isinstance(option, SelectOption):
+        option = option.to_discord_select_option()
+    return SelectOptionSpec.from_option(option)
 
 
 class SelectOption:
+    __slots__ = ('_label', '_value', '_description', '_emoji', '_default')
+
     def __init__(
             self,
             label: str,
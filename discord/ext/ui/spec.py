@@ -0,0 +1,53 @@
+from __future__ import annotations
+from typing import NamedTuple, Optional, TypeVar, Union
+
+import discord
+
+from .cache import LRUCache
+
+S = TypeVar('S')
+
+# 同じ内容のspecは同じインスタンスを共有する
+_specs: LRUCache = LRUCache(4096)
+
+
+def intern_spec(spec: S) -> S:
+    cached = _specs.get(spec)
+    if cached is None:
+        _specs.put(spec, spec)
+        return spec
+    return cached
+
+
+class LinkButtonSpec(NamedTuple):
+    url: str
+    label: str
+
+
+class ButtonSpec(NamedTuple):
+    label: str
+    style: discord.ButtonStyle
+    disabled: bool
+    emoji: Optional[Union[str, discord.PartialEmoji]]
+    custom_id: Optional[str]
+
+
+class SelectOptionSpec(NamedTuple):
+    label: str
+    value: str
+    description: Optional[str]
+    emoji: Optional[Union[str, discord.PartialEmoji]]
+    default: bool
+
+    @classmethod
+    def from_option(cls, option: discord.SelectOption) -> SelectOptionSpec:
+        return intern_spec(cls(option.label, option.value, option.description, option.emoji, option.default))
+
+
+class SelectSpec(NamedTuple):
+    placeholder: Optional[str]
+    min_values: int
+    max_values: int
+    options: tuple[SelectOptionSpec, ...]
+    disabled: bool
+    custom_id: Optional[str]
@@ -1,14 +1,39 @@
 from __future__ import annotations
+import operator
+from typing import Any, Callable, Optional
+
 from .view import View
+from .utils import Comparator, _make_comparator, _has_changed, _load_field, _store_field, _MISSING, _record_read, _field_key, \
+    _FieldProperty
+
 
+def state(
+        name: str,
+        compare: Optional[Comparator] = operator.eq,
+        *,
+        key: Optional[Callable[[Any], Any]] = None
+):
+    """
+    値が変更された時にViewを更新するプロパティを作成します。
+    compareがTrueを返す(同じ値とみなされる)代入では更新しません。
+    compareにNoneを渡すと毎回更新し、keyを渡すとkey(値)同士を比較します。
+    __slots__を使うクラスでは、値は`_<name>_value`というslotに保存されます。
+    """
+    compare = _make_comparator(compare, key)
 
-def state(name: str):
     def getter(instance):
-        return instance.__dict__[name]
+        _record_read(instance, name)
+        value = _load_field(instance, name)
+        if value is _MISSING:
+            raise AttributeError(name)
+        return value
 
     def setter(instance, value):
-        instance.__dict__[name] = value
-        if isinstance(instance, View):
-            instance.update_sync()
+        changed = _has_changed(_load_field(instance, name), value, compare)
+        _store_field(instance, name, value)
+        if changed and isinstance(instance, View):
+            instance.update_sync(_field_key(instance, name))
 
-    return property(getter, setter)
+    field = _FieldProperty(getter, setter)
+    field._field_name = name
+    return field
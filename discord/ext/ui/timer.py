@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from typing import Callable, Hashable, Optional
+
+_log = logging.getLogger(__name__)
+
+
+class _Timer:
+    __slots__ = ('key', 'expires', 'callback', 'level', 'slot')
+
+    def __init__(self, key: Hashable, expires: int, callback: Callable[[], None]) -> None:
+        self.key = key
+        self.expires = expires
+        self.callback = callback
+        self.level = 0
+        self.slot = 0
+
+
+class TimerWheel:
+    """
+    多数のタイムアウトを一つのタスクで管理する階層型タイマーホイールです。
+    登録、延長、取り消しはタイマーの数によらず一定の時間で行われ、
+    期限が来たタイマーはresolution秒ごとにまとめて実行されます。
+    levels段でslots**levels回分(既定では1秒単位で約194日)先まで扱えます。それより先の期限は途中で入れ直されます。
+    """
+    def __init__(self, resolution: float = 1.0, slots: int = 64, levels: int = 4) -> None:
+        self.resolution = resolution
+        self.slots = slots
+        self.levels = levels
+        self._wheels: list[list[dict[Hashable, _Timer]]] = [[{} for _ in range(slots)] for _ in range(levels)]
+        self._timers: dict[Hashable, _Timer] = {}
+        self._tick: int = 0
+        self._started: float = time.monotonic()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._timers
+
+    def _ticks(self, delay: float) -> int:
+        return max(1, math.ceil(delay / self.resolution))
+
+    def _place(self, timer: _Timer) -> None:
+        delta = timer.expires - self._tick
+        level = 0
+        span = 1
+        while level < self.levels - 1 and delta >= span * self.slots:
+            level += 1
+            span *= self.slots
+        # 最上段に収まらない期限は、最上段の最後の位置に置いて後で入れ直す
+        target = min(timer.expires, self._tick + span * self.slots - 1)
+        timer.level = level
+        timer.slot = (target // span) % self.slots
+        self._wheels[level][timer.slot][timer.key] = timer
+
+    def schedule(self, key: Hashable, delay: float, callback: Callable[[], None]) -> None:
+        """
+        delay秒後にcallbackを呼びます。同じkeyのタイマーがある場合は置き換えます。
+        """
+        self.cancel(key)
+        timer = _Timer(key, self._tick + self._ticks(delay), callback)
+        self._timers[key] = timer
+        self._place(timer)
+        self._ensure_running()
+
+    def reset(self, key: Hashable, delay: float) -> bool:
+        """
+        タイマーの期限をdelay秒後に延長します。タイマーがなければFalseを返します。
+        """
+        timer = self._timers.get(key)
+        if timer is None:
+            return False
+        del self._wheels[timer.level][timer.slot][key]
+        timer.expires = self._tick + self._ticks(delay)
+        self._place(timer)
+        return True
+
+    def cancel(self, key: Hashable) -> bool:
+        timer = self._timers.pop(key, None)
+        if timer is None:
+            return False
+        del self._wheels[timer.level][timer.slot][key]
+        return True
+
+    def advance(self, ticks: int = 1) -> list[Hashable]:
+        """
+        時間をticks回分進めて、期限が来たタイマーのcallbackを呼びます。呼ばれたタイマーのkeyを返します。
+        """
+        expired: list[_Timer] = []
+        for _ in range(ticks):
+            self._tick += 1
+            self._cascade()
+            slot = self._wheels[0][self._tick % self.slots]
+            for timer in list(slot.values()):
+                del slot[timer.key]
+                if timer.expires <= self._tick:
+                    del self._timers[timer.key]
+                    expired.append(timer)
+                else:
+                    self._place(timer)
+
+        for timer in expired:
+            try:
+                timer.callback()
+            except Exception:
+                # 一つのcallbackの失敗で他のタイマーが止まらないようにする
+                _log.exception("timer callback for %r failed", timer.key)
+        return [timer.key for timer in expired]
+
+    def _cascade(self) -> None:
+        # 上の段の区切りに来たら、その位置のタイマーを下の段に入れ直す
+        spans = []
+        span = 1
+        for level in range(1, self.levels):
+            span *= self.slots
+            if self._tick % span:
+                break
+            spans.append((level, span))
+        for level, span in reversed(spans):
+            slot = self._wheels[level][(self._tick // span) % self.slots]
+            timers = list(slot.values())
+            slot.clear()
+            for timer in timers:
+                self._place(timer)
+
+    def _ensure_running(self) -> None:
+        if self._task is None or self._task.done():
+            if not self._timers:
+                return
+            self._task = asyncio.get_event_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        # 何もない間に進んだ時間は、タイマーを調べずに飛ばす
+        self._started = time.monotonic() - self._tick * self.resolution
+        while self._timers:
+            next_tick = self._started + (self._tick + 1) * self.resolution
+            await asyncio.sleep(max(0.0, next_tick - time.monotonic()))
+            now_tick = int((time.monotonic() - self._started) / self.resolution)
+            if now_tick > self._tick:
+                self.advance(now_tick - self._tick)
+
+
+default_timer_wheel = TimerWheel()
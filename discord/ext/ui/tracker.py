@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from typing import Optional
+import asyncio
+import uuid
+from typing import Optional, Hashable
 
 import discord
 from discord import ui
@@ -8,48 +10,274 @@ from discord import ui
 from .view import View
 from .provider import BaseProvider
 from .message import Message
+from .modal import Modal
+from .registry import TrackerRegistry, default_registry
+from .dispatcher import ComponentDispatcher
+from .timer import TimerWheel
+from .utils import _format_custom_id
+
+
+# Discordはinteractionから3秒以内の応答を求めるため、deferする余裕を残してこれ以上は待たない
+_RESPONSE_DEADLINE = 2.5
+# custom_idを持ち、dispatcherで振り分けるItem
+_ROUTABLE_ITEMS = (discord.ui.Button, discord.ui.Select)
 
 
 class ViewTracker(ui.View):
-    def __init__(self, view: View, timeout: Optional[float] = 180.0):
-        super().__init__(timeout=timeout)
+    def __init__(
+            self,
+            view: View,
+            timeout: Optional[float] = 180.0,
+            response_timeout: Optional[float] = 2.0,
+            registry: Optional[TrackerRegistry] = None,
+            dispatcher: Optional[ComponentDispatcher] = None,
+            timer_wheel: Optional[TimerWheel] = None
+    ):
+        # timer_wheelを使う場合はdiscord.pyのtimeoutは使わず、期限が来るとViewをstopする
+        super().__init__(timeout=timeout if timer_wheel is None else None)
+        self.timer_wheel: Optional[TimerWheel] = timer_wheel
+        self.expire_after: Optional[float] = timeout if timer_wheel is not None else None
         self.view: View = view
-        self.items: dict[str, str] = {}
+        self.items: dict[Hashable, discord.ui.Item] = {}
         self.body: Optional[Message] = None
         self.message: Optional[discord.Message] = None
         self.provider: Optional[BaseProvider] = None
+        # 再描画中は、その再描画(後続の一回を含む)が終わった時に完了するFuture
+        self._update_done: Optional[asyncio.Future] = None
+        self._update_requested: bool = False
+        # クリック後の再描画をinteractionへの応答として送るまで待つ時間(秒)。Noneで無効
+        self.response_timeout: Optional[float] = response_timeout
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self.registry: TrackerRegistry = registry if registry is not None else default_registry
+        # dispatcherを使う場合はdiscord.pyではなくdispatcherがinteractionを振り分ける
+        self.dispatcher: Optional[ComponentDispatcher] = dispatcher
+        self.route_key: Optional[str] = uuid.uuid4().hex if dispatcher is not None else None
+        self._routes: dict[str, discord.ui.Item] = {}
+        # Falseの場合、Itemのコールバックは描画を共有している別のViewのもの
+        self._own_callbacks: bool = True
 
     async def track(self, provider: BaseProvider):
-        self.body = await self.view.body()
+        self.body = await self.view._render_message()
 
-        while not isinstance(self.body, Message):
-            self.body._super_view = self.view
-            self.body = await self.body.body()
-
-        for item in self.body.get_discord_items():
-            self.add_item(item)
+        self._reconcile(self.body)
+        # 応答で送信した場合はメッセージが分からないことがある。その場合は最初の編集かget_messageで分かる
         self.message = await provider.send_message(self.body._content, self.body._embeds, self)
         self.view._tracker = self
         self.provider = provider
+        self.registry.register(self)
+        self._arm_timer()
+        self.view._checkpoint()
         await self.view.on_appear()
 
-    async def update(self):
-        body = await self.view.body()
+    async def get_message(self) -> Optional[discord.Message]:
+        """
+        送信したメッセージを返します。まだ分かっていない場合はproviderから取得します。
+        """
+        if self.message is None and self.provider is not None:
+            message = await self.provider.get_message()
+            if message is not None and self.message is None:
+                self.message = message
+                self.registry.set_message(self, message)
+        return self.message
 
-        while not isinstance(body, Message):
-            body._super_view = self.view
-            body = await body.body()
+    async def attach(self, provider: BaseProvider, message: discord.Message):
+        """
+        送信済みのメッセージにViewを結び付けます。保存されたViewを復元する際に使われます。
+        """
+        self.body = await self.view._render_message()
 
-        if self.body != body:
-            self.body = body
-            self.clear_items()
-            for item in self.body.get_discord_items():
-                self.add_item(item)
-            await self.provider.edit_message(self.body._content, self.body._embeds, self)
+        self._reconcile(self.body)
+        self.message = message
+        self.view._tracker = self
+        self.provider = provider
+        self.registry.register(self)
+        self._arm_timer()
+
+    async def update(self) -> None:
+        """
+        Viewを再描画します。返った時点で、呼び出した時の状態は描画、送信されています。
+        """
+        # 更新中に呼ばれた場合は最新の状態での再描画を一回だけ予約し、それが終わるまで待つ
+        self._update_requested = True
+        if self._update_done is not None:
+            await asyncio.shield(self._update_done)
+            return
+
+        done = self._update_done = asyncio.get_event_loop().create_future()
+        try:
+            while self._update_requested:
+                self._update_requested = False
+                await self._render()
+            self.view._checkpoint()
+        except asyncio.CancelledError:
+            done.cancel()
+            raise
+        except Exception as e:
+            done.set_exception(e)
+            # 待っている呼び出しがなくても警告が出ないようにする
+            done.exception()
+            raise
+        else:
+            done.set_result(None)
+        finally:
+            self._update_done = None
+            if self.view._update_handle is None:
+                self._idle.set()
+
+    async def _render(self) -> None:
+        body = await self.view._render_message()
+
+        if body is self.body:
+            return
+
+        changed = self.body is None or self.body.fingerprint() != body.fingerprint()
+        self.body = body
+        # 見た目が変わっていなくてもコールバックは新しいものに差し替える
+        self._reconcile(body)
+        if changed:
+            message = await self._edit_message()
+            if message is not None and self.message is None:
+                self.message = message
+                self.registry.set_message(self, message)
             await self.view.on_update()
 
+    async def _edit_message(self) -> Optional[discord.Message]:
+        provider, body = self.provider, self.body
+        if provider is None or body is None:
+            return None
+        if self.view.render_key is None:
+            return await provider.edit_message(body._content, body._embeds, self)
+        # 描画を共有している場合は、同時に編集するメッセージの数を制限する
+        async with self.view.render_cache.edit_semaphore:
+            return await provider.edit_message(body._content, body._embeds, self)
+
+    def _reconcile(self, body: Message):
+        items: dict[Hashable, discord.ui.Item] = {}
+        children: list[discord.ui.Item] = []
+        for key, item, row in body.get_keyed_items():
+            current = self.items.get(key)
+            if current is None or key in items or not item.update_discord_item(current):
+                current = item.to_discord_item(row)
+            custom_id = self.view._component_id(key)
+            if custom_id is None and self.dispatcher is not None and self.route_key is not None:
+                custom_id = _format_custom_id(self.dispatcher.prefix, self.route_key, key)
+            if (custom_id is not None and isinstance(current, _ROUTABLE_ITEMS)
+                    and current.is_dispatchable() and current.custom_id != custom_id):
+                current.custom_id = custom_id
+            items[key] = current
+            children.append(current)
+        self.items = items
+
+        alive = {id(child) for child in children}
+        for child in list(self.children):
+            if id(child) not in alive:
+                self.remove_item(child)
+
+        current_children = self.children
+        if all(a is b for a, b in zip(current_children, children)):
+            for child in children[len(current_children):]:
+                self.add_item(child)
+        else:
+            # 並び順が変わった場合のみ追加し直す
+            self.clear_items()
+            for child in children:
+                self.add_item(child)
+
+        if self.dispatcher is not None:
+            routes: dict[str, discord.ui.Item] = {
+                item.custom_id: item
+                for item in children
+                if isinstance(item, _ROUTABLE_ITEMS) and item.custom_id is not None
+            }
+            self.dispatcher.update(self, self._routes, routes)
+            self._routes = routes
+        self._own_callbacks = self.view.render_key is None
+
+    async def _bind_own_callbacks(self) -> None:
+        """
+        共有された描画のItemは描画したViewのコールバックを持っているため、このViewのbodyから取り直します。
+        """
+        if self._own_callbacks:
+            return
+        body = await self.view._render_chain()
+        for key, item, row in body.get_keyed_items():
+            current = self.items.get(key)
+            if current is not None:
+                item.update_discord_item(current)
+        self._own_callbacks = True
+
+    def _mark_pending(self) -> None:
+        self._idle.clear()
+
+    def _arm_timer(self) -> None:
+        if self.timer_wheel is not None and self.expire_after is not None:
+            self.timer_wheel.schedule(self, self.expire_after, self._expire)
+
+    def _expire(self) -> None:
+        if not self.is_finished() and self.view._tracker is self:
+            self.view._evict()
+
+    def is_dispatchable(self) -> bool:
+        if self.dispatcher is not None:
+            return False
+        return super().is_dispatchable()
+
+    def stop(self) -> None:
+        super().stop()
+        self._idle.set()
+        self.registry.unregister(self)
+        if self.dispatcher is not None:
+            self.dispatcher.remove(self)
+        if self.timer_wheel is not None:
+            self.timer_wheel.cancel(self)
+
+    async def on_timeout(self) -> None:
+        self.registry.unregister(self)
+
+    def _begin_interaction(self, interaction: discord.Interaction) -> None:
+        self.registry.touch(self)
+        if self.timer_wheel is not None and self.expire_after is not None:
+            self.timer_wheel.reset(self, self.expire_after)
+        if self.provider is not None:
+            self.provider.update_interaction(interaction)
+
     async def _scheduled_task(self, item: ui.Item, interaction: discord.Interaction):
-        self.provider.update_interaction(interaction)
+        self._begin_interaction(interaction)
+        await self._bind_own_callbacks()
         await super(ViewTracker, self)._scheduled_task(item, interaction)
-        if not interaction.response.is_done():
-            await interaction.response.defer()
+        await self._respond(interaction)
+
+    async def _submit_modal(self, modal: Modal, interaction: discord.Interaction):
+        """
+        このTrackerから開かれたModalが送信された時に呼ばれます。
+        入力された値を反映し、再描画をModalへの応答として送ります。
+        """
+        self._begin_interaction(interaction)
+        await modal._apply(self.view, interaction)
+        await self._respond(interaction)
+
+    def _response_budget(self, interaction: discord.Interaction) -> float:
+        """
+        interactionが作られてからの経過時間を引いた、再描画を待てる残り秒数を返します。
+        """
+        if self.response_timeout is None:
+            return 0.0
+        elapsed = (discord.utils.utcnow() - interaction.created_at).total_seconds()
+        return min(self.response_timeout, _RESPONSE_DEADLINE - elapsed)
+
+    async def _respond(self, interaction: discord.Interaction):
+        # コールバックで発生した再描画が間に合えば、その編集自体をinteractionへの応答にする
+        if not self._idle.is_set():
+            budget = self._response_budget(interaction)
+            handle = self.view._update_handle
+            if isinstance(handle, asyncio.TimerHandle) and handle.when() > self.view.loop.time() + budget:
+                # update_delayのため再描画が期限より後に始まるので、待たずに応答する
+                budget = 0
+            if budget > 0:
+                try:
+                    await asyncio.wait_for(self._idle.wait(), budget)
+                except asyncio.TimeoutError:
+                    pass
+        if self.provider is not None:
+            await self.provider.acknowledge(interaction)
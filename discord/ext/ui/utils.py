@@ -1,16 +1,114 @@
 from __future__ import annotations
 import asyncio
-from typing import Any, Callable
+import operator
+import weakref
+from contextvars import ContextVar
+from typing import Any, Callable, Hashable, Optional
 
 import discord
 
 
+Comparator = Callable[[Any, Any], bool]
+
+# View.bodyの実行中に読まれたstate/publishedを記録する
+_dependencies: ContextVar[Optional[set[Hashable]]] = ContextVar("_dependencies", default=None)
+
+
 async def _call_any(func: Callable, *args: Any, **kwargs: Any) -> Any:
     if asyncio.iscoroutinefunction(func):
         return await func(*args, **kwargs)
     return func(*args, **kwargs)
 
 
+_coroutine_functions: weakref.WeakKeyDictionary[Callable, bool] = weakref.WeakKeyDictionary()
+
+
+def _is_coroutine_function(func: Callable) -> bool:
+    """
+    asyncio.iscoroutinefunctionの結果を関数ごとに覚えておきます。
+    コールバックを登録する時に呼び、クリックのたびに調べないようにするためのものです。
+    """
+    target = getattr(func, "__func__", func)
+    try:
+        return _coroutine_functions[target]
+    except (KeyError, TypeError):
+        pass
+    result = asyncio.iscoroutinefunction(func)
+    try:
+        _coroutine_functions[target] = result
+    except TypeError:
+        pass
+    return result
+
+
+def _format_custom_id(prefix: str, view_key: str, key: Any) -> str:
+    """
+    Viewのキーとコンポーネントのキー(Message.get_keyed_items)から`prefix:view:item`の形のcustom_idを作ります。
+    """
+    row, _, ident = key
+    item_key = ident if isinstance(ident, str) else f"{'' if row is None else row}.{ident}"
+    return f"{prefix}:{view_key}:{item_key}"
+
+
+def _make_comparator(compare: Optional[Comparator], key: Optional[Callable[[Any], Any]]) -> Optional[Comparator]:
+    if key is None:
+        return compare
+
+    compare = compare or operator.eq
+    return lambda old, new: compare(key(old), key(new))
+
+
+_MISSING: Any = object()
+
+
+def _slot_name(name: str) -> str:
+    return f"_{name}_value"
+
+
+def _load_field(instance: Any, name: str) -> Any:
+    """
+    state/publishedの値を読みます。__slots__を使うクラスでは`_<name>_value`のslotに保存されます。
+    """
+    try:
+        return instance.__dict__.get(name, _MISSING)
+    except AttributeError:
+        return getattr(instance, _slot_name(name), _MISSING)
+
+
+def _store_field(instance: Any, name: str, value: Any) -> None:
+    try:
+        instance.__dict__[name] = value
+    except AttributeError:
+        object.__setattr__(instance, _slot_name(name), value)
+
+
+def _has_changed(old: Any, value: Any, compare: Optional[Comparator]) -> bool:
+    if compare is None or old is _MISSING:
+        return True
+    try:
+        return not compare(old, value)
+    except (TypeError, ValueError):
+        # numpyの配列のように真偽値を決められない値は常に変更扱いにする
+        return True
+
+
+def _field_key(instance: Any, name: str) -> Hashable:
+    return id(instance), name
+
+
+def _record_read(instance: Any, name: str) -> None:
+    dependencies = _dependencies.get()
+    if dependencies is not None:
+        dependencies.add(_field_key(instance, name))
+
+
+class _FieldProperty(property):
+    """
+    state/publishedが作るプロパティです。PersistentViewが保存する値を探せるよう、保存先の名前を持ちます。
+    """
+    _field_name: str
+
+
 def async_interaction_partial(func: Callable, *args: Any, **kwargs: Any) -> Callable:
     async def callback(interaction: discord.Interaction) -> Any:
         return await func(interaction, *args, **kwargs)
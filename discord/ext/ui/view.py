@@ -1,21 +1,38 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Optional, TYPE_CHECKING, Any
+from typing import Optional, TYPE_CHECKING, Any, Hashable
 
 from .message import Message
 from .button import LinkButton
 from .observable_object import ObservableObject
+from .utils import _dependencies
+from .render_cache import RenderCache, default_render_cache
 
 if TYPE_CHECKING:
     from .tracker import ViewTracker
 
 
 class View:
+    # update_syncを受けてから再描画するまでの待ち時間(秒)。
+    # 0の場合は同じイベントループの周回内の変更がまとめて一回の再描画になります。
+    update_delay: float = 0.0
+    # Trueの場合、bodyで読まれたstate/published以外が変更されても再描画しません。
+    # state/published以外の値をbodyで使う場合は、変更後にupdate_sync()を呼んでください。
+    memoize_body: bool = False
+    # render_keyが同じViewは描画結果を共有します。同じ内容を複数のメッセージに表示する場合に指定してください。
+    # 共有されるのは見た目だけで、操作された時はそのViewのbodyからコールバックを取り直します。
+    render_key: Optional[Hashable] = None
+    render_cache: RenderCache = default_render_cache
+
     def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
         self._tracker: Optional['ViewTracker'] = None
         self.loop = loop or asyncio.get_event_loop()
         self._super_view: Optional[View] = None
+        self._update_handle: Optional[asyncio.Handle] = None
+        self._render_cache: Optional[Message | View] = None
+        self._dependencies: set[Hashable] = set()
+        self._dirty: bool = True
 
     async def body(self) -> Message | View:
         return Message()\
@@ -41,19 +58,99 @@ class View:
         """
         pass
 
-    def stop(self):
-        self._tracker.stop()
+    def stop(self) -> None:
+        if self._update_handle is not None:
+            self._update_handle.cancel()
+            self._update_handle = None
+        if self._tracker is not None:
+            self._tracker.stop()
+        if self.render_key is not None:
+            # 止まったViewの描画を他のViewが使い続けないようにします
+            self.render_cache.invalidate(self.render_key)
+        for value in list(vars(self).values()):
+            if isinstance(value, ObservableObject):
+                value.unbind(self)
         self.loop.create_task(self.on_disappear())
 
-    def update_sync(self):
-        if self._tracker is not None:
-            self.loop.create_task(self._tracker.update())
+    def _evict(self) -> None:
+        """
+        TrackerRegistryがメモリを空けるために呼びます。通常のViewはstopされます。
+        """
+        self.stop()
+
+    def _checkpoint(self) -> None:
+        """
+        送信後と再描画の後に呼ばれます。状態を保存するViewが上書きします。
+        """
+        pass
+
+    def _component_id(self, key: Hashable) -> Optional[str]:
+        """
+        コンポーネントのキーからcustom_idを決めます。Noneの場合はdiscord.pyが決めたものを使います。
+        """
+        return None
+
+    async def _render(self) -> Message | View:
+        if self.memoize_body and self._render_cache is not None and not self._dirty:
+            return self._render_cache
+
+        self._dirty = False
+        if not self.memoize_body:
+            return await self.body()
+
+        dependencies: set[Hashable] = set()
+        token = _dependencies.set(dependencies)
+        try:
+            self._render_cache = await self.body()
+        except BaseException:
+            self._dirty = True
+            raise
+        finally:
+            _dependencies.reset(token)
+        self._dependencies = dependencies
+        return self._render_cache
+
+    async def _render_message(self) -> Message:
+        if self.render_key is not None:
+            return await self.render_cache.render(self)
+        return await self._render_chain()
+
+    async def _render_chain(self) -> Message:
+        """
+        bodyがViewを返した場合は、Messageが返されるまで辿って描画します。
+        """
+        view = self
+        body = await view._render()
+        while not isinstance(body, Message):
+            body._super_view = view
+            view = body
+            body = await view._render()
+        return body
+
+    def update_sync(self, changed: Optional[Hashable] = None):
+        if self.render_key is not None:
+            # 描画を共有している他のViewのbodyが読んだ値かもしれないため、memoize_bodyは使わない
+            self.render_cache.invalidate(self.render_key)
+        elif self.memoize_body and changed is not None and changed not in self._dependencies:
+            # bodyで使われていない値の変更なので再描画しない
+            return
+        self._dirty = True
+        if self._tracker is not None and self._update_handle is None:
+            self._tracker._mark_pending()
+            if self.update_delay > 0:
+                self._update_handle = self.loop.call_later(self.update_delay, self._flush_update)
+            else:
+                self._update_handle = self.loop.call_soon(self._flush_update)
         if self._super_view is not None:
             self._super_view.update_sync()
 
+    def _flush_update(self) -> None:
+        self._update_handle = None
+        if self._tracker is not None:
+            self.loop.create_task(self._tracker.update())
+
     def __setattr__(self, key: str, value: Any) -> None:
         if isinstance(value, ObservableObject):
-            if value.view is None:
-                value.view = self
+            value.bind(self)
 
         object.__setattr__(self, key, value)
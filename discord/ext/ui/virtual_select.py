@@ -0,0 +1,136 @@
+from __future__ import annotations
+from typing import Callable, Optional, Union
+
+import discord
+
+from .observable_object import ObservableObject
+from .published import published
+from .select import Select, SelectOption
+from .utils import _call_any
+
+
+class VirtualSelect(ObservableObject):
+    """
+    25個を超える選択肢を、ページ送りと絞り込みをしながら一つのSelectで表示します。
+    選択した値はページを移動しても保持されます。
+    Viewの変数に代入し、body内でto_selectを呼んでSelectを作成してください。
+    """
+    PREVIOUS = "discord-ext-ui:virtual-select:previous"
+    NEXT = "discord-ext-ui:virtual-select:next"
+
+    offset = published("offset")
+    query = published("query")
+
+    def __init__(
+            self,
+            options: list[Union[SelectOption, discord.SelectOption]],
+            *,
+            page_size: int = 23,
+            placeholder: Optional[str] = None,
+            max_values: int = 1,
+            previous_label: str = "◀",
+            next_label: str = "▶",
+    ) -> None:
+        super().__init__()
+        self.options: list[discord.SelectOption] = [
+            option.to_discord_select_option() if isinstance(option, SelectOption) else option
+            for option in options
+        ]
+        self._options_by_value: dict[str, discord.SelectOption] = {option.value: option for option in self.options}
+        self.page_size = page_size
+        self.placeholder = placeholder
+        self.max_values = max_values
+        self._previous = discord.SelectOption(label=previous_label, value=self.PREVIOUS)
+        self._next = discord.SelectOption(label=next_label, value=self.NEXT)
+
+        self._selected: dict[str, None] = {}
+        self._filtered: list[discord.SelectOption] = self.options
+        self._filtered_query = ""
+        self.func: Optional[Callable] = None
+        self.check_func: Optional[Callable[[discord.Interaction], bool]] = None
+
+        self.offset = 0
+        self.query = ""
+
+    @property
+    def selected(self) -> list[discord.SelectOption]:
+        return [self._options_by_value[value] for value in self._selected]
+
+    def get_option(self, value: str) -> Optional[discord.SelectOption]:
+        return self._options_by_value.get(value)
+
+    def filter(self, query: str) -> None:
+        """
+        labelにqueryを含む選択肢だけを表示します。空文字を渡すと絞り込みを解除します。
+        """
+        self.offset = 0
+        self.query = query
+
+    def filtered(self) -> list[discord.SelectOption]:
+        if self._filtered_query != self.query:
+            query = self.query.lower()
+            self._filtered = [option for option in self.options if query in option.label.lower()] \
+                if query else self.options
+            self._filtered_query = self.query
+        return self._filtered
+
+    def window(self) -> list[discord.SelectOption]:
+        return self.filtered()[self.offset:self.offset + self.page_size]
+
+    def on_select(self, func: Callable) -> VirtualSelect:
+        self.func = func
+        return self
+
+    def check(self, func: Callable[[discord.Interaction], bool]) -> VirtualSelect:
+        self.check_func = func
+        return self
+
+    def to_select(self) -> Select:
+        window = self.window()
+        options = []
+        if self.offset > 0:
+            options.append(self._previous)
+        for option in window:
+            # 選択肢は他のVirtualSelectと共有されていることがあるため、表示する分だけ複製して書き換えない
+            options.append(discord.SelectOption(
+                label=option.label,
+                value=option.value,
+                description=option.description,
+                emoji=option.emoji,
+                default=option.value in self._selected,
+            ))
+        if self.offset + self.page_size < len(self.filtered()):
+            options.append(self._next)
+
+        select = Select(
+            placeholder=self.placeholder,
+            min_values=0 if self.max_values > 1 else 1,
+            max_values=max(1, min(self.max_values, len(options))),
+            options=options,
+        ).on_select(self._selected_callback)
+        if self.check_func is not None:
+            select.check(self.check_func)
+        return select
+
+    async def _selected_callback(self, interaction: discord.Interaction, options: list[discord.SelectOption]) -> None:
+        values = [option.value for option in options if option.value not in (self.PREVIOUS, self.NEXT)]
+        changed = False
+        if self.max_values > 1:
+            # 表示中の選択肢だけを送られてきた値で置き換える
+            for option in self.window():
+                self._selected.pop(option.value, None)
+            self._selected.update(dict.fromkeys(values))
+            changed = True
+        elif values:
+            self._selected = dict.fromkeys(values)
+            changed = True
+
+        if any(option.value == self.PREVIOUS for option in options):
+            self.offset = max(0, self.offset - self.page_size)
+        elif any(option.value == self.NEXT for option in options):
+            self.offset = self.offset + self.page_size
+
+        if changed:
+            self.notify()
+            if self.func is not None:
+                await _call_any(self.func, interaction, self.selected)
@@ -1,4 +1,4 @@
-from discord.ext.ui import Button, View, Message, ViewTracker, MessageProvider, Modal
+from discord.ext.ui import Button, View, Message, ViewTracker, MessageProvider, Modal, state
 import discord
 from discord.ui import TextInput
 import os
@@ -11,20 +11,23 @@ client = discord.Client(intents=intents)
 
 
 class SampleView(View):
+    text = state("text")
+
     def __init__(self):
         super().__init__()
+        self.text = "hello!"
 
     async def delete(self, interaction: discord.Interaction):
         await interaction.message.delete()
         self.stop()
 
     async def body(self):
+        text_input = TextInput(label="test dayo", default=self.text)
         return Message(
+            content=self.text,
             components=[
                 Button("show modal")
-                .modal(Modal("test", [
-                    TextInput(label="test dayo", default="hello!")
-                ]))
+                .modal(Modal("test", [text_input]).bind("text", text_input))
             ]
         )
 
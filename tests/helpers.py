@@ -0,0 +1,12 @@
+class FakeTracker:
+    """
+    ViewTrackerの代わりに、update_syncから呼ばれたupdateの回数だけを数えます。
+    """
+    def __init__(self):
+        self.updates = 0
+
+    async def update(self):
+        self.updates += 1
+
+    def _mark_pending(self):
+        pass
@@ -0,0 +1,71 @@
+import asyncio
+from types import SimpleNamespace
+
+import discord
+
+from discord.ext.ui import ActionButton, Poll, ViewTracker
+from discord.ext.ui.provider import BaseProvider
+
+from helpers import FakeTracker
+
+
+def click(user_id):
+    return SimpleNamespace(user=SimpleNamespace(id=user_id))
+
+
+def test_poll_dedupes_votes_and_coalesces_renders():
+    async def main():
+        poll = Poll("lunch", "", [
+            ActionButton("sushi", discord.ButtonStyle.primary, "sushi"),
+            ActionButton("ramen", discord.ButtonStyle.primary, "ramen"),
+        ], allow_change=True)
+        poll.update_delay = 0.01
+        poll._tracker = FakeTracker()
+        await poll.body()
+
+        sushi, ramen = poll._flat_buttons()
+        for user_id in range(100):
+            sushi.callback_func(click(user_id))
+        sushi.callback_func(click(0))
+        ramen.callback_func(click(1))
+
+        assert poll.tally == {"sushi": 99, "ramen": 1}
+        assert len(poll.votes) == 100
+        await asyncio.sleep(0.05)
+        assert poll._tracker.updates == 1
+
+        message = await poll.body()
+        assert message._embeds[0].fields[0].value == "99票 (99%)"
+
+    asyncio.run(main())
+
+
+class SlowProvider(BaseProvider):
+    def __init__(self, tracker):
+        super().__init__()
+        self.tracker = tracker
+        self.edits = []
+
+    async def edit_message(self, content, embeds, view):
+        await asyncio.sleep(0.02)
+        self.edits.append((embeds[0].footer.text, self.tracker.is_finished()))
+
+
+def test_poll_close_waits_for_the_vote_render_in_flight():
+    async def main():
+        poll = Poll("lunch", "", [ActionButton("sushi", discord.ButtonStyle.primary, "sushi")])
+        poll.update_delay = 0
+        tracker = ViewTracker(poll, None, response_timeout=None)
+        tracker.provider = SlowProvider(tracker)
+        poll._tracker = tracker
+        tracker.body = await poll._render_message()
+
+        poll._flat_buttons()[0].callback_func(click(1))
+        await asyncio.sleep(0.005)
+        assert tracker._update_done is not None
+
+        await poll._finish()
+        assert tracker.provider.edits == [("合計 1票", False), ("合計 1票 (終了)", False)]
+        assert tracker.is_finished()
+
+    asyncio.run(main())
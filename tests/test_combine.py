@@ -1,4 +1,6 @@
-from discord.ext.ui.combine import Just, PassThroughSubject
+import asyncio
+
+from discord.ext.ui.combine import AsyncPublisher, Just, PassThroughSubject
 
 
 def assert_two(x, y):
@@ -16,3 +18,94 @@ def test_just_2():
 def test_subject_1():
     sub = PassThroughSubject()
     sub.sink(lambda x: assert_two(x, 1)).send(1)
+
+
+def test_map_chain():
+    received = []
+    Just(1).map(lambda x: x + 1).map(lambda x: x * 10).map(str).sink(received.append)
+    assert received == ["20"]
+
+
+def test_subject_map_chain():
+    received = []
+    sub = PassThroughSubject()
+    sub.map(lambda x: x * 2).map(lambda x: x + 1).sink(received.append)
+    sub.send(1)
+    sub.send([1, 2])
+    assert received == [3, [3, 5]]
+
+
+def test_deep_chain_does_not_recurse():
+    received = []
+    publisher = Just(0)
+    for _ in range(5000):
+        publisher.map(lambda x: x + 1)
+    publisher.sink(received.append)
+    assert received == [5000]
+
+
+def test_async_map_chain():
+    async def double(x):
+        return x * 2
+
+    class AsyncJust(AsyncPublisher):
+        def __init__(self, value):
+            super().__init__()
+            self.value = value
+
+        async def dispatch(self):
+            await self.upstream(self.value)
+
+    received = []
+    asyncio.run(AsyncJust(1).map(double).map(lambda x: x + 1).sink(received.append))
+    assert received == [3]
+
+
+def test_share_dispatches_once():
+    class CountingJust(Just):
+        dispatched = 0
+
+        def dispatch(self):
+            CountingJust.dispatched += 1
+            super().dispatch()
+
+    computed = []
+    first, second, direct = [], [], []
+    shared = CountingJust(2).map(lambda x: computed.append(x) or x * 10).share()
+    shared.map(lambda x: x + 1).sink(first.append)
+    shared.map(str).map(lambda x: x + "!").sink(second.append)
+    shared.sink(direct.append)
+
+    assert CountingJust.dispatched == 1
+    assert computed == [2]
+    assert (first, second, direct) == ([21], ["20!"], [20])
+
+
+def test_share_fans_out_subject_values():
+    sub = PassThroughSubject()
+    shared = sub.map(lambda x: x * 2).share()
+    first, second = [], []
+    shared.map(lambda x: x + 1).sink(first.append)
+    shared.branch().sink(second.append)
+    sub.send(1)
+    sub.send(2)
+    assert (first, second) == ([3, 5], [2, 4])
+
+
+def test_async_share_dispatches_once():
+    class AsyncSource(AsyncPublisher):
+        dispatched = 0
+
+        async def dispatch(self):
+            AsyncSource.dispatched += 1
+            await self.upstream(1)
+
+    async def main():
+        first, second = [], []
+        shared = AsyncSource().share()
+        await shared.map(lambda x: x + 1).sink(first.append)
+        await shared.map(lambda x: x * 5).sink(second.append)
+        return first, second
+
+    assert asyncio.run(main()) == ([2], [5])
+    assert AsyncSource.dispatched == 1
@@ -0,0 +1,35 @@
+import discord
+
+from discord.ext.ui import Button, LinkButton, Message, Select, SelectOption
+
+
+def build(label: str = "a") -> Message:
+    return Message(
+        "content",
+        embeds=[discord.Embed(title="title", description="description")],
+        components=[
+            [Button(label).style(discord.ButtonStyle.green), LinkButton("https://example.com", "link")],
+            Select().options([SelectOption("one"), SelectOption("two", "2")]),
+        ],
+    )
+
+
+def test_same_render_has_same_fingerprint():
+    assert build().fingerprint() == build().fingerprint()
+    assert build() == build()
+
+
+def test_changed_render_has_different_fingerprint():
+    assert build("a").fingerprint() != build("b").fingerprint()
+
+
+def test_fingerprint_is_reset_by_builder_methods():
+    message = build()
+    before = message.fingerprint()
+    message.content("changed")
+    assert message.fingerprint() != before
+
+
+def test_identical_specs_are_shared():
+    assert Button("<").style(discord.ButtonStyle.green).spec() is Button("<", discord.ButtonStyle.green).spec()
+    assert Button("<").spec() is not Button(">").spec()
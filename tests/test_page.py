@@ -0,0 +1,183 @@
+import asyncio
+
+from discord.ext.ui import CallablePageSource, IteratorPageSource, Message, PageView, PaginationView
+
+
+class CountingPage(PageView):
+    def __init__(self, number):
+        super().__init__()
+        self.number = number
+        self.renders = 0
+        self.appears = 0
+
+    async def on_appear(self, paginator):
+        self.appears += 1
+
+    async def body(self, paginator):
+        self.renders += 1
+        return Message(f"page {self.number}")
+
+
+def test_pages_are_cached_and_prefetched():
+    async def main():
+        pages = [CountingPage(i) for i in range(4)]
+        paginator = PaginationView(pages, cache_size=3, prefetch=True)
+        assert (await paginator._render_message())._content == "page 0"
+        await asyncio.sleep(0.01)
+        assert pages[1].renders == 1
+
+        paginator.page = 1
+        assert (await paginator._render_message())._content == "page 1"
+        await asyncio.sleep(0.01)
+        paginator.page = 0
+        await paginator._render_message()
+        return [page.renders for page in pages]
+
+    assert asyncio.run(main()) == [1, 1, 1, 0]
+
+
+def test_iterator_source_discovers_page_count():
+    async def pages():
+        for i in range(3):
+            yield CountingPage(i)
+
+    async def main():
+        paginator = PaginationView(IteratorPageSource(pages))
+        assert paginator.max_page is None
+        message = await paginator._render_message()
+        assert message._content == "page 0"
+
+        paginator.page = 5
+        message = await paginator._render_message()
+        assert message._content == "page 2"
+        return paginator.page, paginator.max_page
+
+    assert asyncio.run(main()) == (2, 2)
+
+
+def test_callable_source():
+    async def get(index):
+        return CountingPage(index)
+
+    async def main():
+        paginator = PaginationView(CallablePageSource(get, 1000))
+        paginator.page = 999
+        return (await paginator._render_message())._content
+
+    assert asyncio.run(main()) == "page 999"
+
+
+def test_on_appear_runs_only_for_shown_pages():
+    async def main():
+        pages = [CountingPage(i) for i in range(3)]
+        paginator = PaginationView(pages, cache_size=3, prefetch=True)
+        await paginator._render_message()
+        await asyncio.sleep(0.01)
+        assert [(page.renders, page.appears) for page in pages] == [(1, 1), (1, 0), (0, 0)]
+
+        paginator.page = 1
+        await paginator._render_message()
+        paginator.page = 0
+        await paginator._render_message()
+        await asyncio.sleep(0.01)
+        return [(page.renders, page.appears) for page in pages]
+
+    assert asyncio.run(main()) == [(1, 2), (1, 1), (1, 0)]
+
+
+def test_prefetch_failures_are_logged(caplog):
+    class BrokenPage(CountingPage):
+        async def body(self, paginator):
+            raise RuntimeError("broken")
+
+    async def main():
+        paginator = PaginationView([CountingPage(0), BrokenPage(1)], cache_size=3, prefetch=True)
+        await paginator._render_message()
+        await asyncio.sleep(0.01)
+        return paginator._rendering
+
+    assert asyncio.run(main()) == {}
+    assert "failed to prefetch page 1" in caplog.text
+
+
+def test_iterator_source_prefetches_forward_only():
+    started = []
+
+    async def pages():
+        started.append(True)
+        for i in range(5):
+            yield CountingPage(i)
+
+    async def main():
+        paginator = PaginationView(IteratorPageSource(pages), cache_size=5, prefetch=True, first_page=2)
+        await paginator._render_message()
+        await asyncio.sleep(0.01)
+        return sorted(paginator._page_cache._data)
+
+    assert asyncio.run(main()) == [2, 3]
+    assert len(started) == 1
+
+
+def test_estimated_count_does_not_stop_paging():
+    async def get(index):
+        return CountingPage(index) if index < 10 else None
+
+    def labels(message):
+        return [item._label for row in message._components for item in row if not item._disabled or "/" in item._label]
+
+    async def main():
+        paginator = PaginationView(CallablePageSource(get, count=3, estimated=True))
+        paginator.page = 2
+        message = await paginator._render_message()
+        assert labels(message) == ["<<", "<", "3/~3", ">"]
+
+        paginator.page = 3
+        message = await paginator._render_message()
+        assert message._content == "page 3"
+        assert labels(message) == ["<<", "<", "4/~4", ">"]
+
+        for page in range(4, 11):
+            paginator.page = page
+            message = await paginator._render_message()
+        assert message._content == "page 9"
+        assert labels(message) == ["<<", "<", "10/10"]
+
+    asyncio.run(main())
+
+
+def test_prefetch_renders_with_its_own_page_index():
+    seen = []
+
+    class IndexPage(PageView):
+        async def body(self, paginator):
+            seen.append((paginator.page, paginator.rendering_page))
+            return Message(f"page {paginator.rendering_page}")
+
+    async def main():
+        paginator = PaginationView([IndexPage() for _ in range(3)], first_page=1, cache_size=3, prefetch=True)
+        assert (await paginator._render_message())._content == "page 1"
+        await asyncio.sleep(0.01)
+        return sorted(seen)
+
+    assert asyncio.run(main()) == [(1, 0), (1, 1), (1, 2)]
+
+
+def test_invalidate_cancels_a_running_prefetch():
+    class SlowPage(CountingPage):
+        async def body(self, paginator):
+            await asyncio.sleep(0.05)
+            return await super().body(paginator)
+
+    async def main():
+        pages = [SlowPage(i) for i in range(2)]
+        paginator = PaginationView(pages, cache_size=3, prefetch=True)
+        await paginator._render_message()
+        await asyncio.sleep(0)
+        task = paginator._rendering[1]
+
+        paginator.invalidate(1)
+        paginator.page = 1
+        assert (await paginator._render_message())._content == "page 1"
+        return task.cancelled(), pages[1].renders
+
+    assert asyncio.run(main()) == (True, 1)
@@ -0,0 +1,177 @@
+import asyncio
+from types import SimpleNamespace
+
+import discord
+
+from discord.ext.ui import (
+    Button, ComponentDispatcher, LinkButton, Message, ObservableObject, PersistentView, PersistentViewManager,
+    SQLiteViewStore, TrackerRegistry, ViewTracker, published, state,
+)
+
+
+class Settings(ObservableObject):
+    theme = published("theme")
+
+    def __init__(self):
+        super().__init__()
+        self.theme = "light"
+
+
+class Counter(PersistentView, name="test.counter"):
+    count = state("count")
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+        self.settings = Settings()
+
+    async def body(self):
+        return Message(f"{self.count} {self.settings.theme}")\
+            .item(Button("+").on_click(self.increment))\
+            .item(LinkButton("https://example.com", "link"))
+
+    async def increment(self, interaction):
+        self.count += 1
+
+
+def test_persistent_view_round_trip():
+    async def main():
+        store = SQLiteViewStore()
+        registry = TrackerRegistry(max_trackers=0)
+        view = Counter()
+        view.store = store
+        view.count = 3
+        view.settings.theme = "dark"
+
+        tracker = ViewTracker(view, timeout=None, registry=registry)
+        await tracker.attach(None, None)
+        button, link = tracker.children
+        assert button.custom_id == f"ui:{view.persistent_key}:.0"
+        assert link.custom_id is None
+
+        registry.register(tracker)
+        assert tracker not in registry and tracker.is_finished()
+        assert view._tracker is None
+
+        await view._store_future
+        name, data = store.load(view.persistent_key)
+        restored = Counter.restore(view.persistent_key, data)
+        assert name == "test.counter"
+        assert (restored.count, restored.settings.theme) == (3, "dark")
+        assert restored.settings.view is restored
+
+        restored.store = store
+        restored._tracker = ViewTracker(restored, timeout=None, registry=registry)
+        restored.stop()
+        await restored._store_future
+        assert store.load(view.persistent_key) is None
+
+    asyncio.run(main())
+
+
+class FakeResponse:
+    def __init__(self):
+        self.calls = []
+
+    def is_done(self):
+        return bool(self.calls)
+
+    async def edit_message(self, content, embeds, view):
+        self.calls.append(("edit_message", content))
+
+    async def defer(self):
+        self.calls.append(("defer", None))
+
+
+class FakeChannel(discord.abc.Messageable):
+    id = 1
+    guild = None
+
+
+class FakeClient:
+    def __init__(self):
+        self.views = []
+
+    def add_view(self, view, *, message_id=None):
+        self.views.append((view, message_id))
+
+
+def test_manager_restores_an_evicted_view_on_interaction():
+    async def main():
+        store = SQLiteViewStore()
+        registry = TrackerRegistry()
+        view = Counter()
+        view.store = store
+        view.count = 3
+        tracker = ViewTracker(view, timeout=None, registry=registry)
+        await tracker.attach(None, None)
+        custom_id = tracker.children[0].custom_id
+        registry.evict(tracker)
+        await view._store_future
+
+        client = FakeClient()
+        manager = PersistentViewManager(client, store, registry=registry)
+        interaction = SimpleNamespace(
+            type=discord.InteractionType.component,
+            data={"custom_id": custom_id},
+            message=SimpleNamespace(id=42),
+            channel=FakeChannel(),
+            response=FakeResponse(),
+            created_at=discord.utils.utcnow(),
+        )
+        assert await manager.on_interaction(interaction)
+
+        restored = registry.get(42)
+        assert client.views == [(restored, 42)]
+        assert restored.view is not view and restored.view.persistent_key == view.persistent_key
+
+        await asyncio.sleep(0.1)
+        assert interaction.response.calls == [("edit_message", "4 light")]
+        await restored.view._store_future
+        assert store.load(view.persistent_key)[1]["fields"]["count"] == 4
+
+    asyncio.run(main())
+
+
+def test_manager_restores_once_for_concurrent_clicks():
+    async def main():
+        store = SQLiteViewStore()
+        registry = TrackerRegistry()
+        view = Counter()
+        view.store = store
+        tracker = ViewTracker(view, timeout=None, registry=registry)
+        await tracker.attach(None, None)
+        custom_id = tracker.children[0].custom_id
+        registry.evict(tracker)
+        await view._store_future
+
+        client = FakeClient()
+        manager = PersistentViewManager(client, store, registry=registry)
+        interactions = [
+            SimpleNamespace(
+                type=discord.InteractionType.component,
+                data={"custom_id": custom_id},
+                message=SimpleNamespace(id=42),
+                channel=FakeChannel(),
+                response=FakeResponse(),
+                created_at=discord.utils.utcnow(),
+            )
+            for _ in range(2)
+        ]
+        results = await asyncio.gather(*(manager.on_interaction(interaction) for interaction in interactions))
+        assert results == [True, True]
+        assert len(client.views) == 1
+        assert manager._restoring == {}
+
+        restored = registry.get(42)
+        await asyncio.sleep(0.1)
+        assert restored.view.count == 2
+
+    asyncio.run(main())
+
+
+def test_manager_ignores_dispatcher_custom_ids():
+    manager = PersistentViewManager(FakeClient(), SQLiteViewStore())
+    dispatcher = ComponentDispatcher()
+    assert manager.parse(f"{dispatcher.prefix}:key:0.0") is None
+    assert manager.parse(f"{manager.prefix}:key:0.0") == "key"
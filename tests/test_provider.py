@@ -0,0 +1,84 @@
+import asyncio
+from types import SimpleNamespace
+
+import discord
+
+from discord.ext.ui import TrackerRegistry, View, ViewTracker
+from discord.ext.ui.provider import InteractionProvider
+from discord.ext.ui.ratelimit import EditQueue
+
+
+class FakeResponse:
+    def __init__(self, result=None):
+        self._responded = False
+        self.result = result
+
+    def is_done(self):
+        return self._responded
+
+    async def send_message(self, *args, **kwargs):
+        self._responded = True
+        return self.result
+
+
+class FakeInteraction:
+    def __init__(self, response):
+        self.type = discord.InteractionType.application_command
+        self.channel_id = 1
+        self.guild_id = None
+        self.user = SimpleNamespace(id=2)
+        self.message = None
+        self.response = response
+        self.fetches = 0
+        self.edited = SimpleNamespace(id=10)
+
+    async def original_message(self):
+        self.fetches += 1
+        return SimpleNamespace(id=10)
+
+    async def edit_original_message(self, **kwargs):
+        return self.edited
+
+
+def test_edit_uses_the_returned_message_without_fetching():
+    async def main():
+        interaction = FakeInteraction(FakeResponse())
+        provider = InteractionProvider(interaction, edit_queue=EditQueue())
+        assert await provider.send_message("a", [], None) is None
+        assert await provider.edit_message("b", [], None) is interaction.edited
+        assert await provider.edit_message("c", [], None) is interaction.edited
+        assert provider.message is interaction.edited
+        assert interaction.fetches == 0
+
+    asyncio.run(main())
+
+
+def test_get_message_fetches_once():
+    async def main():
+        interaction = FakeInteraction(FakeResponse())
+        provider = InteractionProvider(interaction, edit_queue=EditQueue())
+        await provider.send_message("a", [], None)
+        message = await provider.get_message()
+        assert await provider.get_message() is message
+        assert provider.message is message
+        assert interaction.fetches == 1
+
+    asyncio.run(main())
+
+
+def test_track_fetches_the_message_only_when_asked():
+    async def main():
+        interaction = FakeInteraction(FakeResponse())
+        registry = TrackerRegistry()
+        tracker = ViewTracker(View(), registry=registry)
+        await tracker.track(InteractionProvider(interaction, edit_queue=EditQueue()))
+        assert tracker.message is None
+        assert interaction.fetches == 0
+
+        message = await tracker.get_message()
+        assert await tracker.get_message() is message
+        assert registry.get(message.id) is tracker
+        assert interaction.fetches == 1
+        tracker.stop()
+
+    asyncio.run(main())
@@ -0,0 +1,39 @@
+import asyncio
+import time
+
+from discord.ext.ui import EditQueue
+
+
+def test_pending_edits_are_merged():
+    async def main():
+        queue = EditQueue(rate=1, per=0.05)
+        sent = []
+
+        def edit(value):
+            async def _edit():
+                sent.append(value)
+                return value
+            return _edit
+
+        results = await asyncio.gather(*(queue.submit("channel", "message", edit(i)) for i in range(5)))
+        return sent, results
+
+    sent, results = asyncio.run(main())
+    assert sent == [0, 4]
+    assert results == [0, 4, 4, 4, 4]
+
+
+def test_channel_budget_is_shared():
+    async def main():
+        queue = EditQueue(rate=2, per=0.1)
+
+        async def edit():
+            return time.monotonic()
+
+        start = time.monotonic()
+        times = await asyncio.gather(*(queue.submit("channel", i, edit) for i in range(4)))
+        return [t - start for t in times]
+
+    elapsed = asyncio.run(main())
+    assert elapsed[0] < 0.04 and elapsed[1] < 0.04
+    assert elapsed[3] >= 0.09
@@ -0,0 +1,50 @@
+import asyncio
+
+from discord.ext.ui import TrackerRegistry, View, ViewTracker
+
+
+def make_tracker(registry):
+    view = View()
+    tracker = ViewTracker(view, registry=registry)
+    view._tracker = tracker
+    return tracker
+
+
+def test_registry_evicts_least_recently_used():
+    async def main():
+        registry = TrackerRegistry(max_trackers=2)
+        first, second, third = (make_tracker(registry) for _ in range(3))
+        registry.register(first)
+        registry.register(second)
+        registry.touch(first)
+        registry.register(third)
+
+        assert second not in registry
+        assert second.is_finished()
+        assert first in registry and third in registry
+        assert registry.estimate_memory(first) > 0
+
+        first.view.stop()
+        assert len(registry) == 1
+
+    asyncio.run(main())
+
+
+def test_registry_evicts_idle_trackers_without_further_registrations():
+    async def main():
+        registry = TrackerRegistry(idle_timeout=0.1)
+        idle, active = make_tracker(registry), make_tracker(registry)
+        registry.register(idle)
+        registry.register(active)
+        await asyncio.sleep(0.06)
+        registry.touch(active)
+
+        await asyncio.sleep(0.08)
+        assert idle not in registry and idle.is_finished()
+        assert active in registry
+
+        await asyncio.sleep(0.1)
+        assert len(registry) == 0 and active.is_finished()
+        assert registry._sweep_handle is None
+
+    asyncio.run(main())
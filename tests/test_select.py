@@ -0,0 +1,39 @@
+import asyncio
+
+from discord.ext.ui import SelectOption, VirtualSelect
+
+
+def test_virtual_select_keeps_selection_across_windows():
+    async def main():
+        select = VirtualSelect([SelectOption(f"item {i}", str(i)) for i in range(100)], max_values=5)
+        first = select.to_select()
+        assert len(first._options) == 24
+        assert first._options[-1].value == VirtualSelect.NEXT
+
+        await select._selected_callback(None, [select.get_option("1"), first._options[-1]])
+        assert select.offset == 23
+        second = select.to_select()
+        assert second._options[0].value == VirtualSelect.PREVIOUS
+
+        await select._selected_callback(None, [select.get_option("30")])
+        assert [option.value for option in select.selected] == ["1", "30"]
+
+        select.filter("item 9")
+        assert [option.value for option in select.window()] == ["9"] + [str(i) for i in range(90, 100)]
+
+    asyncio.run(main())
+
+
+def test_virtual_selects_do_not_share_defaults():
+    async def main():
+        catalog = [SelectOption(f"item {i}", str(i)).to_discord_select_option() for i in range(5)]
+        a = VirtualSelect(catalog)
+        b = VirtualSelect(catalog)
+        await a._selected_callback(None, [a.get_option("1")])
+        built = a.to_select()
+        b.to_select()
+
+        assert [option.default for option in built._options] == [False, True, False, False, False]
+        assert not any(option.default for option in catalog)
+
+    asyncio.run(main())
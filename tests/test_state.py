@@ -0,0 +1,64 @@
+import operator
+
+from discord.ext.ui import ObservableObject, published
+
+
+class Model(ObservableObject):
+    value = published("value")
+    identity = published("identity", operator.is_)
+    always = published("always", None)
+    keyed = published("keyed", key=lambda x: x["id"])
+
+    def __init__(self):
+        super().__init__()
+        self.notified = 0
+        self.value = 0
+        self.identity = []
+        self.always = 0
+        self.keyed = {"id": 1, "name": "a"}
+        self.notified = 0
+
+    def notify(self, changed=None):
+        self.notified += 1
+
+
+def test_equal_value_is_skipped():
+    model = Model()
+    model.value = 0
+    assert model.notified == 0
+    model.value = 1
+    assert model.notified == 1
+
+
+def test_custom_comparators():
+    model = Model()
+    model.identity = []
+    assert model.notified == 1
+    model.always = 0
+    assert model.notified == 2
+    model.keyed = {"id": 1, "name": "b"}
+    assert model.notified == 2
+    model.keyed = {"id": 2, "name": "b"}
+    assert model.notified == 3
+
+
+class SlottedModel(ObservableObject):
+    __slots__ = ("_value_value", "notified")
+    value = published("value")
+
+    def __init__(self):
+        super().__init__()
+        self.notified = 0
+
+    def notify(self, changed=None):
+        self.notified += 1
+
+
+def test_published_on_slotted_object():
+    model = SlottedModel()
+    assert not hasattr(model, "__dict__")
+    assert not hasattr(model, "value")
+    model.value = 1
+    model.value = 1
+    assert model.value == 1
+    assert model.notified == 1
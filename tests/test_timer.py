@@ -0,0 +1,57 @@
+import asyncio
+
+from discord.ext.ui import TimerWheel, View, ViewTracker
+
+
+def test_timer_wheel_expires_across_levels():
+    async def main():
+        wheel = TimerWheel(resolution=3600, slots=4, levels=3)
+        fired = []
+        for delay in (1, 3, 4, 5, 17, 40, 100):
+            wheel.schedule(delay, delay * 3600, lambda delay=delay: fired.append(delay))
+        wheel.cancel(5)
+        assert wheel.reset(3, 6 * 3600)
+
+        expired = []
+        for _ in range(120):
+            expired.extend(wheel.advance())
+        assert fired == [1, 4, 3, 17, 40, 100]
+        assert expired == fired and len(wheel) == 0
+        wheel._task.cancel()
+
+    asyncio.run(main())
+
+
+def test_timer_wheel_logs_failed_callbacks(caplog):
+    def broken():
+        raise RuntimeError("broken")
+
+    async def main():
+        wheel = TimerWheel(resolution=1, slots=4, levels=1)
+        fired = []
+        wheel.schedule("broken", 1, broken)
+        wheel.schedule("ok", 1, lambda: fired.append("ok"))
+        expired = wheel.advance()
+        wheel._task.cancel()
+        return expired, fired
+
+    assert asyncio.run(main()) == (["broken", "ok"], ["ok"])
+    assert "timer callback for 'broken' failed" in caplog.text
+
+
+def test_tracker_expires_through_timer_wheel():
+    async def main():
+        wheel = TimerWheel(resolution=3600)
+        view = View()
+        tracker = ViewTracker(view, timeout=7200, timer_wheel=wheel)
+        assert tracker.timeout is None
+        view._tracker = tracker
+        tracker._arm_timer()
+
+        wheel.advance()
+        assert not tracker.is_finished()
+        wheel.advance()
+        assert tracker.is_finished() and len(wheel) == 0
+        wheel._task.cancel()
+
+    asyncio.run(main())
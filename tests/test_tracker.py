@@ -0,0 +1,195 @@
+import asyncio
+import datetime
+from types import SimpleNamespace
+
+import discord
+
+from discord.ext.ui import Button, ComponentDispatcher, LinkButton, Message, Modal, View, ViewTracker, state
+from discord.ext.ui.provider import BaseProvider
+
+
+def grid(labels):
+    return Message(components=[[Button(label) for label in row] for row in labels])
+
+
+def test_reconcile_reuses_items():
+    async def main():
+        tracker = ViewTracker(View())
+        tracker._reconcile(grid([["a", "b"], ["c"]]))
+        before = list(tracker.children)
+
+        tracker._reconcile(grid([["a", "x"], ["c"]]))
+        after = list(tracker.children)
+        assert [a is b for a, b in zip(before, after)] == [True, True, True]
+        assert after[1].label == "x"
+
+        tracker._reconcile(grid([["a", "x"], ["c", "d"]]))
+        assert tracker.children[:3] == after
+        assert tracker.children[3].label == "d"
+
+        tracker._reconcile(grid([["a"]]))
+        assert tracker.children == after[:1]
+
+    asyncio.run(main())
+
+
+def test_reconcile_replaces_items_of_another_type():
+    async def main():
+        tracker = ViewTracker(View())
+        tracker._reconcile(Message(components=[[Button("a")]]))
+        before = tracker.children[0]
+        tracker._reconcile(Message(components=[[LinkButton("https://example.com", "a")]]))
+        assert tracker.children[0] is not before
+        assert tracker.children[0].style == discord.ButtonStyle.link
+
+    asyncio.run(main())
+
+
+def test_dispatcher_routes_by_custom_id():
+    async def main():
+        clicked = []
+        dispatcher = ComponentDispatcher()
+        tracker = ViewTracker(View(), dispatcher=dispatcher)
+        tracker._reconcile(Message(components=[[Button("a").on_click(clicked.append), Button("b")]]))
+        first, second = tracker.children
+        assert first.custom_id == f"uir:{tracker.route_key}:0.0"
+        assert not tracker.is_dispatchable()
+        assert dispatcher.get(first.custom_id) == (tracker, first)
+        assert first._callback_is_coroutine is False
+
+        tracker._reconcile(Message(components=[[Button("a")]]))
+        assert dispatcher.get(second.custom_id) is None
+        tracker.stop()
+        assert len(dispatcher) == 0
+
+    asyncio.run(main())
+
+
+class FormView(View):
+    name = state("name")
+
+    def __init__(self, render_delay=0.0):
+        super().__init__()
+        self.name = ""
+        self.render_delay = render_delay
+
+    async def body(self):
+        if self.render_delay:
+            await asyncio.sleep(self.render_delay)
+        return Message(f"hello {self.name}")
+
+
+class FakeResponse:
+    def __init__(self):
+        self.calls = []
+
+    def is_done(self):
+        return bool(self.calls)
+
+    async def edit_message(self, content, embeds, view):
+        self.calls.append(("edit_message", content))
+
+    async def defer(self):
+        self.calls.append(("defer", None))
+
+
+class EditingProvider(BaseProvider):
+    def __init__(self):
+        super().__init__()
+        self.queued_edits = []
+
+    async def edit_message(self, content, embeds, view):
+        if not await self.respond_with_edit(content, embeds, view):
+            self.queued_edits.append(content)
+
+
+def make_interaction(kind, age=0.0):
+    return SimpleNamespace(
+        type=kind,
+        response=FakeResponse(),
+        created_at=discord.utils.utcnow() - datetime.timedelta(seconds=age),
+    )
+
+
+async def make_form_tracker(render_delay=0.0):
+    view = FormView(render_delay)
+    tracker = ViewTracker(view)
+    view._tracker = tracker
+    tracker.provider = EditingProvider()
+    tracker.body = await view._render_message()
+    return view, tracker
+
+
+def test_fast_render_is_sent_as_the_interaction_response():
+    async def main():
+        view, tracker = await make_form_tracker()
+        interaction = make_interaction(discord.InteractionType.component)
+        tracker._begin_interaction(interaction)
+        view.name = "sushi"
+        await tracker._respond(interaction)
+
+        assert interaction.response.calls == [("edit_message", "hello sushi")]
+        assert tracker.provider.queued_edits == []
+
+    asyncio.run(main())
+
+
+def test_slow_render_defers_within_the_interaction_deadline():
+    async def main():
+        view, tracker = await make_form_tracker(render_delay=0.3)
+        # 作られてから2.4秒経ったinteractionなので、残りは0.1秒しかない
+        interaction = make_interaction(discord.InteractionType.component, age=2.4)
+        tracker._begin_interaction(interaction)
+        view.name = "sushi"
+        await tracker._respond(interaction)
+        assert interaction.response.calls == [("defer", None)]
+
+        await asyncio.sleep(0.4)
+        assert interaction.response.calls == [("defer", None)]
+        assert tracker.provider.queued_edits == ["hello sushi"]
+
+    asyncio.run(main())
+
+
+def test_delayed_update_past_the_deadline_defers_immediately():
+    async def main():
+        view, tracker = await make_form_tracker()
+        view.update_delay = 5.0
+        interaction = make_interaction(discord.InteractionType.component)
+        tracker._begin_interaction(interaction)
+        view.name = "sushi"
+        started = view.loop.time()
+        await tracker._respond(interaction)
+        assert interaction.response.calls == [("defer", None)]
+        assert view.loop.time() - started < 0.5
+        view.stop()
+
+    asyncio.run(main())
+
+
+def test_modal_submit_is_answered_with_the_rerendered_view():
+    async def main():
+        view, tracker = await make_form_tracker()
+        modal = Modal("form", []).bind("name", SimpleNamespace(value="sushi"))
+        modal.tracker = tracker
+        interaction = make_interaction(discord.InteractionType.modal_submit)
+        await modal.on_submit(interaction)
+        assert interaction.response.calls == [("edit_message", "hello sushi")]
+
+    asyncio.run(main())
+
+
+def test_expired_modal_submit_defers_immediately():
+    async def main():
+        view, tracker = await make_form_tracker()
+        modal = Modal("form", []).bind("name", SimpleNamespace(value="sushi"))
+        modal.tracker = tracker
+        interaction = make_interaction(discord.InteractionType.modal_submit, age=3.0)
+        await modal.on_submit(interaction)
+        assert interaction.response.calls == [("defer", None)]
+
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert tracker.provider.queued_edits == ["hello sushi"]
+
+    asyncio.run(main())
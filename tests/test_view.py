@@ -0,0 +1,266 @@
+import asyncio
+import gc
+
+from discord.ext.ui import Button, Message, ObservableObject, View, ViewGroup, ViewTracker, published, state
+
+from helpers import FakeTracker
+
+
+class CounterView(View):
+    count = state("count")
+    label = state("label")
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+        self.label = ""
+
+
+def test_update_sync_coalesces_writes():
+    async def main():
+        view = CounterView()
+        view._tracker = tracker = FakeTracker()
+        view.count = 1
+        view.count = 2
+        view.label = "changed"
+        await asyncio.sleep(0.01)
+        return tracker.updates
+
+    assert asyncio.run(main()) == 1
+
+
+def test_update_delay_window():
+    async def main():
+        view = CounterView()
+        view.update_delay = 0.05
+        view._tracker = tracker = FakeTracker()
+        view.count = 1
+        await asyncio.sleep(0.01)
+        view.count = 2
+        await asyncio.sleep(0.01)
+        assert tracker.updates == 0
+        await asyncio.sleep(0.1)
+        return tracker.updates
+
+    assert asyncio.run(main()) == 1
+
+
+def test_tracker_update_is_single_flight():
+    from discord.ext.ui import ViewTracker
+
+    class SlowTracker(ViewTracker):
+        renders = 0
+
+        async def _render(self):
+            self.renders += 1
+            await asyncio.sleep(0.01)
+
+    async def main():
+        tracker = SlowTracker(CounterView())
+        await asyncio.gather(*(tracker.update() for _ in range(5)))
+        return tracker.renders
+
+    assert asyncio.run(main()) == 2
+
+
+class MemoView(View):
+    memoize_body = True
+    count = state("count")
+    last_click = state("last_click")
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+        self.last_click = 0
+        self.renders = 0
+
+    async def body(self):
+        self.renders += 1
+        return Message(f"{self.count}")
+
+
+def test_memoized_body_ignores_unread_state():
+    async def main():
+        view = MemoView()
+        view._tracker = tracker = FakeTracker()
+        first = await view._render()
+        view.last_click = 1
+        await asyncio.sleep(0.01)
+        assert tracker.updates == 0
+        assert await view._render() is first
+
+        view.count = 1
+        await asyncio.sleep(0.01)
+        assert tracker.updates == 1
+        assert (await view._render())._content == "1"
+        return view.renders
+
+    assert asyncio.run(main()) == 2
+
+
+class Panel(View):
+    count = state("count")
+
+    def __init__(self, name):
+        super().__init__()
+        self.name = name
+        self.count = 0
+        self.renders = 0
+
+    async def body(self):
+        self.renders += 1
+        return Message(f"{self.name}: {self.count}", components=[[Button(self.name)]])
+
+
+def test_group_renders_only_dirty_children():
+    async def main():
+        a, b = Panel("a"), Panel("b")
+        group = ViewGroup(a, b)
+        message = await group._render_message()
+        assert message._content == "a: 0\nb: 0"
+        assert len(message.get_keyed_items()) == 2
+
+        b.count = 1
+        message = await group._render_message()
+        assert message._content == "a: 0\nb: 1"
+        return a.renders, b.renders
+
+    assert asyncio.run(main()) == (1, 2)
+
+
+class Scoreboard(ObservableObject):
+    score = published("score")
+
+    def __init__(self):
+        super().__init__()
+        self.score = 0
+
+
+def test_observable_object_fans_out_to_weak_views():
+    async def main():
+        board = Scoreboard()
+        views = [View() for _ in range(3)]
+        trackers = [FakeTracker() for _ in views]
+        for view, tracker in zip(views, trackers):
+            view.board = board
+            view._tracker = tracker
+        assert len(board.views) == 3
+
+        board.score = 1
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert [tracker.updates for tracker in trackers] == [1, 1, 1]
+
+        trackers[0].stop = lambda: None
+        views[0].stop()
+        del views[1]
+        gc.collect()
+        assert board.views == [views[-1]]
+
+    asyncio.run(main())
+
+
+class BoardView(View):
+    render_key = "board"
+    renders = 0
+
+    def __init__(self, board):
+        super().__init__()
+        self.board = board
+
+    async def body(self):
+        BoardView.renders += 1
+        return Message(str(self.board.score))
+
+
+class RecordingProvider:
+    def __init__(self):
+        self.edits = []
+
+    async def edit_message(self, content, embeds, view):
+        self.edits.append(content)
+
+
+def test_views_with_same_render_key_share_one_render():
+    async def main():
+        board = Scoreboard()
+        trackers = []
+        for _ in range(3):
+            tracker = ViewTracker(BoardView(board))
+            tracker.provider = RecordingProvider()
+            tracker.view._tracker = tracker
+            trackers.append(tracker)
+
+        board.score = 1
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert BoardView.renders == 1
+        assert [tracker.provider.edits for tracker in trackers] == [["1"]] * 3
+        assert trackers[0].body is trackers[1].body is trackers[2].body
+
+        board.score = 2
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert BoardView.renders == 2
+
+    asyncio.run(main())
+
+
+class ClickBoardView(View):
+    render_key = "click-board"
+
+    def __init__(self, board):
+        super().__init__()
+        self.board = board
+        self.clicks = 0
+
+    async def click(self, interaction):
+        self.clicks += 1
+
+    async def body(self):
+        return Message(str(self.board.score), components=[Button("+").on_click(self.click)])
+
+
+def test_shared_render_dispatches_to_the_owning_view():
+    async def main():
+        board = Scoreboard()
+        trackers = []
+        for _ in range(2):
+            tracker = ViewTracker(ClickBoardView(board))
+            tracker.provider = RecordingProvider()
+            tracker.view._tracker = tracker
+            trackers.append(tracker)
+
+        board.score = 1
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert trackers[0].body is trackers[1].body
+
+        for tracker in trackers:
+            await tracker._bind_own_callbacks()
+            await tracker.children[0].callback(None)
+        assert [tracker.view.clicks for tracker in trackers] == [1, 1]
+
+    asyncio.run(main())
+
+
+def test_tracker_update_waits_for_the_trailing_render():
+    class SlowTracker(ViewTracker):
+        rendered = None
+
+        async def _render(self):
+            count = self.view.count
+            await asyncio.sleep(0.01)
+            self.rendered = count
+
+    async def main():
+        view = CounterView()
+        tracker = SlowTracker(view)
+        first = asyncio.ensure_future(tracker.update())
+        await asyncio.sleep(0)
+        view.count = 1
+        await tracker.update()
+        assert tracker.rendered == 1
+        await first
+
+    asyncio.run(main())